@@ -0,0 +1,308 @@
+"""Benchmark the path management hot paths without Blender.
+
+Builds synthetic scenes on top of `fake_bpy` and a temporary omoospace on
+disk, then reports wall time, calls into Omoospace/Opath and peak memory
+for every entry point.
+
+Usage:
+    python benchmarks/bench_paths.py
+    python benchmarks/bench_paths.py --sizes 100 10000 --entry draw_item
+    python benchmarks/bench_paths.py --json bench.json
+"""
+
+import argparse
+import contextlib
+import functools
+import gc
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+import fake_bpy  # noqa: E402
+
+bpy = fake_bpy.install()
+
+from omoospace import Omoospace, Opath, create_omoospace  # noqa: E402
+
+import omoospaceblender  # noqa: E402
+from omoospaceblender import manage_paths, path_index, utils  # noqa: E402
+
+SIZES = (100, 10_000, 100_000)
+
+COUNTED = (
+    (Omoospace, "__init__"),
+    (Omoospace, "_read_profile"),
+    (Omoospace, "is_content"),
+    (Opath, "resolve"),
+    (Opath, "exists"),
+)
+
+call_counts = {}
+
+
+def install_counters():
+    for cls, name in COUNTED:
+        key = f"{cls.__name__}.{name}"
+        function = getattr(cls, name)
+
+        @functools.wraps(function)
+        def counted(*args, __key=key, __function=function, **kwargs):
+            call_counts[__key] += 1
+            return __function(*args, **kwargs)
+
+        setattr(cls, name, counted)
+
+    reset_counters()
+
+
+def reset_counters():
+    for cls, name in COUNTED:
+        call_counts[f"{cls.__name__}.{name}"] = 0
+
+
+# Synthetic scenes
+#################################################
+
+
+def create_temp_omoospace() -> Omoospace:
+    under = tempfile.mkdtemp(prefix="omoospace_bench_")
+    omoospace = create_omoospace(name="Bench", under=under)
+    return omoospace
+
+
+def build_scene(omoospace: Omoospace, size: int):
+    """Fill bpy.data with `size` datablocks that have paths.
+
+    Half of the paths point into the contents dir (relative or absolute),
+    the rest point outside of the omoospace.
+    """
+    bpy.data.clear()
+    utils.subspace_data.load()
+    blend_file = omoospace.subspaces_dir / "Seq010_Shot0100.blend"
+    blend_file.touch()
+    bpy.data.filepath = str(blend_file)
+    utils.clear_omoospace_cache()
+    path_index.invalidate_path_index()
+
+    contents_dir = omoospace.contents_dir
+
+    def input_path(i: int, category: str, name: str) -> str:
+        kind = i % 4
+        if kind == 0:
+            return f"//../Contents/{category}/{name}"
+        if kind == 1:
+            return str(contents_dir / category / name)
+        if kind == 2:
+            return f"/mnt/library/{category}/{name}"
+        return f"//textures/{name}"
+
+    weights = (
+        ("images", 50),
+        ("sounds", 5),
+        ("volumes", 5),
+        ("cache_files", 5),
+        ("libraries", 5),
+        ("strips", 10),
+        ("modifiers", 20),
+    )
+    counts = {name: max(1, size * weight // 100) for name, weight in weights}
+
+    for i in range(counts["images"]):
+        name = f"img_{i:06d}.png" if i % 10 else f"seq_{i:06d}.0001.exr"
+        bpy.data.images.new(f"Image{i}", filepath=input_path(i, "Images", name))
+
+    for i in range(counts["sounds"]):
+        path = input_path(i, "Audios", f"sound_{i:06d}.wav")
+        bpy.data.sounds.new(f"Sound{i}", filepath=path)
+
+    for i in range(counts["volumes"]):
+        path = input_path(i, "Volumes", f"volume_{i:06d}.vdb")
+        bpy.data.volumes.new(f"Volume{i}", filepath=path, is_sequence=False)
+
+    for i in range(counts["cache_files"]):
+        path = input_path(i, "Dynamics", f"cache_{i:06d}.abc")
+        bpy.data.cache_files.new(f"Cache{i}", filepath=path)
+
+    for i in range(counts["libraries"]):
+        path = input_path(i, "Libraries", f"lib_{i:06d}.blend")
+        bpy.data.libraries.new(f"Library{i}", filepath=path)
+
+    strips = [
+        fake_bpy.Strip(
+            f"Strip{i}",
+            "IMAGE" if i % 2 else "MOVIE",
+            directory=input_path(i, "Images", f"strip_{i:06d}"),
+            filepath=input_path(i, "Videos", f"strip_{i:06d}.mp4"),
+        )
+        for i in range(counts["strips"])
+    ]
+    fake_bpy.new_scene("Scene", "//../Contents/Renders/Scene/", strips)
+
+    for i in range(counts["modifiers"]):
+        bake_directory = input_path(i, "GeometryNodes", f"bake_{i:06d}")
+        modifier = fake_bpy.NodesModifier("GeometryNodes", bake_directory)
+        bpy.data.objects.new(f"Object{i}", modifiers=[modifier])
+
+
+# Entry points
+#################################################
+
+
+def setup_noop(omoospace):
+    return None
+
+
+def run_collect_input_paths(omoospace, state):
+    path_index.invalidate_path_index()
+    manage_paths.collect_input_paths()
+    manage_paths.collect_output_paths()
+
+
+def run_correct_path_on_load_post(omoospace, state):
+    path_index.invalidate_path_index()
+    manage_paths.correct_path_on_load_post()
+
+
+def setup_load_post_unchanged(omoospace):
+    # as after a normal load and save of the same file
+    with contextlib.redirect_stdout(io.StringIO()):
+        manage_paths.correct_path_on_load_post()
+        path_index.invalidate_path_index()
+        utils.set_subspace_data(
+            "rel_contents_dir", utils.opath_to_bpath(omoospace.contents_dir)
+        )
+        manage_paths.store_path_fingerprint_on_save_pre(bpy.data.filepath)
+
+
+def setup_save_pre(omoospace):
+    save_dir = omoospace.subspaces_dir / "Seq010"
+    save_dir.mkdir(exist_ok=True)
+    return str(save_dir / "Seq010_Shot0100.blend")
+
+
+def run_correct_path_on_save_pre(omoospace, blend_file):
+    # saved into another folder of the same omoospace, input files stay
+    path_index.invalidate_path_index()
+    manage_paths.correct_path_on_save_pre(blend_file)
+
+
+def setup_render_paths(omoospace):
+    records = list(manage_paths.collect_input_paths().values())
+    records += manage_paths.collect_output_paths().values()
+    return records
+
+
+def run_render_paths(omoospace, records):
+    utils.clear_omoospace_cache()
+    manage_paths.render_paths(records)
+
+
+def setup_input_dialog(omoospace):
+    operator = manage_paths.ManageInputPaths()
+    operator.invoke(bpy.context, None)
+    for index, input_path in enumerate(operator.input_paths):
+        input_path.selected = index % 2 == 0
+    ui_list = manage_paths.OMOOSPACE_UL_InputPathList()
+    return operator, ui_list
+
+
+def run_draw_item(omoospace, state):
+    operator, ui_list = state
+    layout = fake_bpy.UILayout()
+    for input_path in operator.input_paths:
+        ui_list.draw_item(bpy.context, layout, operator, input_path, 0, None, "")
+
+
+def run_filter_items(omoospace, state):
+    operator, ui_list = state
+    ui_list.filter_items(bpy.context, operator, "input_paths")
+
+
+ENTRY_POINTS = {
+    "collect_input_paths": (setup_noop, run_collect_input_paths),
+    "correct_path_on_load_post": (setup_noop, run_correct_path_on_load_post),
+    "correct_path_on_load_post_unchanged": (
+        setup_load_post_unchanged,
+        run_correct_path_on_load_post,
+    ),
+    "correct_path_on_save_pre": (setup_save_pre, run_correct_path_on_save_pre),
+    "render_paths": (setup_render_paths, run_render_paths),
+    "draw_item": (setup_input_dialog, run_draw_item),
+    "filter_items": (setup_input_dialog, run_filter_items),
+}
+
+
+def measure(omoospace, size: int, entry: str) -> dict:
+    setup, run = ENTRY_POINTS[entry]
+
+    # timed run, with call counters
+    build_scene(omoospace, size)
+    state = setup(omoospace)
+    reset_counters()
+    gc.collect()
+    # the handlers print every changed path
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run(omoospace, state)
+        wall = time.perf_counter() - start
+    counts = dict(call_counts)
+
+    # separate run for memory, tracemalloc slows everything down
+    build_scene(omoospace, size)
+    state = setup(omoospace)
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(omoospace, state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "entry": entry,
+        "size": size,
+        "wall_ms": round(wall * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+        "calls": counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "--entry", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS)
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    omoospaceblender.register()
+    install_counters()
+    omoospace = create_temp_omoospace()
+    print(f"omoospace: {omoospace.root_dir}")
+    width = max(map(len, ENTRY_POINTS)) + 2
+
+    results = []
+    for size in args.sizes:
+        for entry in args.entry:
+            result = measure(omoospace, size, entry)
+            results.append(result)
+            calls = " ".join(f"{k}={v}" for k, v in result["calls"].items() if v)
+            print(
+                f"{entry:<{width}}{size:>8}{result['wall_ms']:>12.1f} ms"
+                f"{result['peak_kb']:>12.1f} KiB  {calls}"
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the add-on startup without Blender.
+
+Every run is a fresh Python process on top of `fake_bpy`: import the
+add-on, register it and fire load_post for the unsaved startup file, as
+Blender does at launch. Reports the median time of each step, and which
+heavy third-party packages got imported.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --src path/to/other/src
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+HEAVY_PACKAGES = ("omoospace", "pypinyin", "ruamel.yaml", "nutree")
+
+RUN = """
+import sys, time, json
+sys.path[:0] = [{benchmarks!r}, {src!r}]
+import fake_bpy
+bpy = fake_bpy.install()
+
+times = {{}}
+start = time.perf_counter()
+import omoospaceblender
+times["import"] = time.perf_counter() - start
+
+start = time.perf_counter()
+omoospaceblender.register()
+times["register"] = time.perf_counter() - start
+
+start = time.perf_counter()
+for handler in bpy.app.handlers.load_post:
+    handler(None)
+times["load_post"] = time.perf_counter() - start
+
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"times": times, "heavy": heavy}}))
+"""
+
+
+def run_once(src: Path) -> dict:
+    code = RUN.format(benchmarks=str(ROOT), src=str(src), heavy=HEAVY_PACKAGES)
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--src", default=str(ROOT.parent / "src"), help="Folder with omoospaceblender"
+    )
+    args = parser.parse_args()
+
+    results = [run_once(Path(args.src).resolve()) for _ in range(args.runs)]
+
+    steps = list(results[0]["times"])
+    for step in steps + ["total"]:
+        if step == "total":
+            values = [sum(result["times"].values()) for result in results]
+        else:
+            values = [result["times"][step] for result in results]
+        print(f"{step:<12}{statistics.median(values) * 1000:>10.1f} ms")
+
+    heavy = sorted({name for result in results for name in result["heavy"]})
+    print(f"imported: {', '.join(heavy) or 'none of ' + ', '.join(HEAVY_PACKAGES)}")
+
+
+if __name__ == "__main__":
+    main()
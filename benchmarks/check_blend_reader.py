@@ -0,0 +1,114 @@
+"""Check blend_reader against path_index on a file saved by real Blender.
+
+Needs the `bpy` module (pip install bpy), not `fake_bpy`. Builds a scene
+with every kind of path the add-on manages, saves it, then compares the
+records `read_blend_paths` reads from the file with the records
+`collect_input_paths`/`collect_output_paths` build from bpy.data. Exits
+with 1 and lists the differences if they disagree.
+
+Usage:
+    python benchmarks/check_blend_reader.py
+    python benchmarks/check_blend_reader.py --keep
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+
+import bpy  # noqa: E402
+
+from omoospaceblender.blend_reader import read_blend_paths  # noqa: E402
+from omoospaceblender.path_index import (  # noqa: E402
+    collect_input_paths,
+    collect_output_paths,
+    invalidate_path_index,
+)
+
+INPUT_FIELDS = ("label", "path", "category", "is_sequence", "is_packed")
+OUTPUT_FIELDS = ("label", "path", "category", "name", "suffix", "in_folder")
+
+
+def build_scene(dir: Path):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+    scene.render.filepath = "//renders/shot_"
+
+    image = bpy.data.images.new("tex", 4, 4)
+    image.filepath = "//textures/tex.png"
+    udim = bpy.data.images.new("udim", 4, 4)
+    udim.filepath = "//textures/udim.<UDIM>.png"
+    sequence = bpy.data.images.new("seq", 4, 4)
+    sequence.filepath = "//frames/seq.0001.png"
+    for name in ("tex", "udim", "seq"):
+        bpy.data.images[name].use_fake_user = True
+
+    volume = bpy.data.volumes.new("smoke")
+    volume.filepath = "//vdb/smoke.vdb"
+    volume.use_fake_user = True
+
+    # a linked object in the scene keeps the library when saving
+    library_file = dir / "library.blend"
+    prop = bpy.data.objects.new("prop", bpy.data.meshes.new("prop"))
+    bpy.data.libraries.write(str(library_file), {prop})
+    bpy.data.objects.remove(prop)
+    with bpy.data.libraries.load(str(library_file), link=True) as (data_from, data_to):
+        data_to.objects = list(data_from.objects)
+    scene.collection.objects.link(data_to.objects[0])
+
+    mesh = bpy.data.meshes.new("mesh")
+    obj = bpy.data.objects.new("ob", mesh)
+    scene.collection.objects.link(obj)
+    modifier = obj.modifiers.new("GN", "NODES")
+    modifier.bake_directory = "//bake/gn"
+
+    editor = scene.sequence_editor_create()
+    strip = editor.strips.new_image("frames", "//frames/seq.0001.png", 1, 1)
+    strip.directory = "//frames/"
+
+
+def compare(name: str, read: dict, collected: dict, fields: tuple) -> list[str]:
+    problems = []
+    for parm in sorted(read.keys() | collected.keys()):
+        if parm not in read:
+            problems.append(f"{name}: {parm} is not read from the file")
+            continue
+        if parm not in collected:
+            problems.append(f"{name}: {parm} is read but not collected")
+            continue
+        for field in fields:
+            expected = getattr(collected[parm], field)
+            actual = getattr(read[parm], field)
+            if actual != expected:
+                problems.append(f"{name}: {parm}.{field} {actual!r} != {expected!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep", action="store_true", help="Keep the saved file")
+    args = parser.parse_args()
+
+    dir = Path(tempfile.mkdtemp(prefix="omoospace_reader_"))
+    build_scene(dir)
+    blend_file = dir / "main.blend"
+    bpy.ops.wm.save_as_mainfile(filepath=str(blend_file))
+
+    invalidate_path_index()
+    inputs, outputs = read_blend_paths(blend_file)
+    problems = compare("input", inputs, collect_input_paths(), INPUT_FIELDS)
+    problems += compare("output", outputs, collect_output_paths(), OUTPUT_FIELDS)
+
+    for problem in problems:
+        print(problem)
+    print(f"{len(inputs)} inputs, {len(outputs)} outputs, {len(problems)} differences")
+    if args.keep:
+        print(f"saved: {blend_file}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
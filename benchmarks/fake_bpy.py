@@ -0,0 +1,463 @@
+"""A lightweight stand-in for the `bpy` module.
+
+Only what the add-on touches is implemented: datablock collections,
+`bpy.path.abspath/relpath`, texts, property groups with update callbacks,
+UI lists and app handlers. Call `install()` before importing the add-on.
+"""
+
+import os
+import sys
+import types
+from pathlib import Path
+
+
+# Properties
+#################################################
+
+
+class _PropertyDeferred:
+    def __init__(self, function, keywords):
+        self.function = function
+        self.keywords = keywords
+
+    def default(self):
+        if "default" in self.keywords:
+            return self.keywords["default"]
+        if self.function is EnumProperty:
+            return self.keywords["items"][0][0]
+        if self.function is CollectionProperty:
+            return Collection(self.keywords.get("type"))
+        if self.function is PointerProperty:
+            return self.keywords["type"]()
+        return PROPERTY_DEFAULTS.get(self.function.__name__)
+
+    def __get__(self, instance, owner):
+        # e.g. bpy.types.WindowManager.old_path_list = CollectionProperty(...)
+        if instance is None:
+            return self
+        return instance.__dict__.setdefault(f"_prop_{id(self)}", self.default())
+
+
+def StringProperty(**keywords):
+    return _PropertyDeferred(StringProperty, keywords)
+
+
+def BoolProperty(**keywords):
+    return _PropertyDeferred(BoolProperty, keywords)
+
+
+def IntProperty(**keywords):
+    return _PropertyDeferred(IntProperty, keywords)
+
+
+def EnumProperty(**keywords):
+    return _PropertyDeferred(EnumProperty, keywords)
+
+
+def PointerProperty(**keywords):
+    return _PropertyDeferred(PointerProperty, keywords)
+
+
+def CollectionProperty(**keywords):
+    return _PropertyDeferred(CollectionProperty, keywords)
+
+
+PROPERTY_DEFAULTS = {"StringProperty": "", "BoolProperty": False, "IntProperty": 0}
+
+_property_lookup = {}
+
+
+def _find_property(cls, name):
+    key = (cls, name)
+    if key not in _property_lookup:
+        prop = None
+        for klass in cls.__mro__:
+            value = klass.__dict__.get("__annotations__", {}).get(name)
+            if isinstance(value, _PropertyDeferred):
+                prop = value
+                break
+        _property_lookup[key] = prop
+    return _property_lookup[key]
+
+
+class Collection(list):
+    def __init__(self, type=None):
+        super().__init__()
+        self.type = type
+
+    def clear(self):
+        del self[:]
+
+    def add(self):
+        item = self.type()
+        self.append(item)
+        return item
+
+
+class _Struct:
+    """Resolves annotated properties and runs their update callbacks."""
+
+    def __getattr__(self, name):
+        prop = _find_property(type(self), name)
+        if prop is None:
+            raise AttributeError(name)
+        value = prop.default()
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        prop = _find_property(type(self), name)
+        if prop is not None and "update" in prop.keywords:
+            prop.keywords["update"](self, context)
+
+
+# Types
+#################################################
+
+
+class UILayout:
+    def split(self, factor=0.0, align=False):
+        return self
+
+    def row(self, align=False):
+        return self
+
+    def box(self):
+        return self
+
+    def prop(self, data, property, **kwargs):
+        pass
+
+    def label(self, **kwargs):
+        pass
+
+    def separator(self):
+        pass
+
+    def menu(self, *args, **kwargs):
+        pass
+
+    def template_list(self, *args, **kwargs):
+        pass
+
+    def operator(self, idname, **kwargs):
+        return types.SimpleNamespace()
+
+
+class Operator(_Struct):
+    def __init__(self):
+        object.__setattr__(self, "layout", UILayout())
+        object.__setattr__(self, "reports", [])
+
+    def report(self, type, message):
+        self.reports.append((type, message))
+
+
+class PropertyGroup(_Struct):
+    pass
+
+
+class AddonPreferences(_Struct):
+    pass
+
+
+class UIList(_Struct):
+    bitflag_filter_item = 1 << 30
+    layout_type = "DEFAULT"
+
+
+class UI_UL_list:
+    @staticmethod
+    def sort_items_by_name(items, propname="name"):
+        order = sorted(range(len(items)), key=lambda i: getattr(items[i], propname))
+        neworder = [0] * len(items)
+        for new, old in enumerate(order):
+            neworder[old] = new
+        return neworder
+
+
+class Menu(_Struct):
+    pass
+
+
+class Panel(_Struct):
+    pass
+
+
+class Header(_Struct):
+    pass
+
+
+class _Appendable:
+    @classmethod
+    def append(cls, draw):
+        pass
+
+    @classmethod
+    def prepend(cls, draw):
+        pass
+
+    @classmethod
+    def remove(cls, draw):
+        pass
+
+
+class TOPBAR_MT_editor_menus(_Appendable):
+    pass
+
+
+class FILEBROWSER_PT_bookmarks_favorites(_Appendable):
+    pass
+
+
+class WindowManager(_Struct):
+    pass
+
+
+# Data
+#################################################
+
+
+class ID:
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.users = 1
+        self.packed_file = None
+        self.__dict__.update(kwargs)
+
+    def unpack(self, method="USE_LOCAL"):
+        pass
+
+    def pack(self):
+        pass
+
+
+class Text(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.body = ""
+
+    def as_string(self):
+        return self.body
+
+    def clear(self):
+        self.body = ""
+
+    def write(self, text):
+        self.body += text
+
+
+class IDCollection(dict):
+    def __init__(self, type=ID):
+        super().__init__()
+        self.type = type
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def new(self, name, **kwargs):
+        block = self.type(name, **kwargs)
+        self[name] = block
+        return block
+
+
+class BlendData:
+    def __init__(self):
+        self.filepath = ""
+        self.images = IDCollection()
+        self.sounds = IDCollection()
+        self.volumes = IDCollection()
+        self.cache_files = IDCollection()
+        self.libraries = IDCollection()
+        self.scenes = IDCollection()
+        self.objects = IDCollection()
+        self.texts = IDCollection(Text)
+
+    def clear(self):
+        self.__init__()
+
+
+class NodesModifier:
+    def __init__(self, name, bake_directory=""):
+        self.name = name
+        self.bake_directory = bake_directory
+
+
+class Strip:
+    def __init__(self, name, type, directory="", filepath=""):
+        self.name = name
+        self.type = type
+        self.directory = directory
+        self.filepath = filepath
+
+
+def new_scene(name, render_filepath="", strips=()):
+    render = types.SimpleNamespace(
+        filepath=render_filepath,
+        image_settings=types.SimpleNamespace(file_format="PNG"),
+    )
+    sequence_editor = types.SimpleNamespace(strips_all=list(strips)) if strips else None
+    return data.scenes.new(name, render=render, sequence_editor=sequence_editor)
+
+
+# bpy.path
+#################################################
+
+
+def abspath(path, start=None, library=None):
+    if not path.startswith("//"):
+        return path
+    start = start or os.path.dirname(data.filepath)
+    return os.path.join(str(start), path[2:])
+
+
+def relpath(path, start=None):
+    if path.startswith("//"):
+        return path
+    start = start or os.path.dirname(data.filepath)
+    try:
+        rel = os.path.relpath(path, str(start))
+    except ValueError:
+        return path
+    return "//" + rel.replace(os.sep, "/")
+
+
+def basename(path):
+    return os.path.basename(path.removeprefix("//"))
+
+
+# Context
+#################################################
+
+
+class _WindowManager(WindowManager):
+    def __init__(self):
+        self.windows = []
+
+    def progress_begin(self, min, max):
+        pass
+
+    def progress_update(self, value):
+        pass
+
+    def progress_end(self):
+        pass
+
+    def invoke_props_dialog(self, operator, width=300):
+        return {"RUNNING_MODAL"}
+
+
+def persistent(function):
+    return function
+
+
+def _new_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+data = BlendData()
+context = types.SimpleNamespace()
+
+
+def install(package="omoospaceblender"):
+    """Register the fake modules in sys.modules, returns the fake bpy."""
+    props = _new_module(
+        "bpy.props",
+        _PropertyDeferred=_PropertyDeferred,
+        StringProperty=StringProperty,
+        BoolProperty=BoolProperty,
+        IntProperty=IntProperty,
+        EnumProperty=EnumProperty,
+        PointerProperty=PointerProperty,
+        CollectionProperty=CollectionProperty,
+    )
+    bpy_types = _new_module(
+        "bpy.types",
+        Operator=Operator,
+        PropertyGroup=PropertyGroup,
+        AddonPreferences=AddonPreferences,
+        UIList=UIList,
+        UI_UL_list=UI_UL_list,
+        Menu=Menu,
+        Panel=Panel,
+        Header=Header,
+        TOPBAR_MT_editor_menus=TOPBAR_MT_editor_menus,
+        FILEBROWSER_PT_bookmarks_favorites=FILEBROWSER_PT_bookmarks_favorites,
+        WindowManager=WindowManager,
+    )
+    handlers = _new_module(
+        "bpy.app.handlers",
+        persistent=persistent,
+        **{
+            name: []
+            for name in (
+                "load_pre",
+                "load_post",
+                "save_pre",
+                "save_post",
+                "depsgraph_update_post",
+                "undo_post",
+                "redo_post",
+            )
+        },
+    )
+    timers = _new_module(
+        "bpy.app.timers",
+        register=lambda *a, **k: None,
+        unregister=lambda function: None,
+        is_registered=lambda function: False,
+    )
+    app = _new_module(
+        "bpy.app",
+        version=(4, 2, 0),
+        version_string="4.2.0",
+        handlers=handlers,
+        timers=timers,
+    )
+    path = _new_module(
+        "bpy.path", abspath=abspath, relpath=relpath, basename=basename
+    )
+    utils = _new_module(
+        "bpy.utils",
+        register_class=lambda cls: None,
+        unregister_class=lambda cls: None,
+    )
+
+    preferences = types.SimpleNamespace(
+        omoospace_home=str(Path.home()),
+        background_transfers=False,
+        transfer_strategy="COPY",
+    )
+    context.window_manager = _WindowManager()
+    context.preferences = types.SimpleNamespace(
+        addons={package: types.SimpleNamespace(preferences=preferences)}
+    )
+
+    bpy = _new_module(
+        "bpy",
+        data=data,
+        context=context,
+        props=props,
+        types=bpy_types,
+        app=app,
+        path=path,
+        utils=utils,
+        ops=types.SimpleNamespace(),
+    )
+
+    sys.modules.update(
+        {
+            "bpy": bpy,
+            "bpy.props": props,
+            "bpy.types": bpy_types,
+            "bpy.app": app,
+            "bpy.app.handlers": handlers,
+            "bpy.app.timers": timers,
+            "bpy.path": path,
+            "bpy.utils": utils,
+        }
+    )
+    return bpy
@@ -1,7 +1,11 @@
 from pathlib import Path
+import ast
+import json
+import pkgutil
 import shutil
 import subprocess
 import sys
+from collections import deque
 from dataclasses import dataclass
 import tomlkit
 
@@ -29,15 +33,184 @@ platforms = {
 
 packages_to_remove = {"imagecodecs", "numpy"}
 
+package_dirpath = Path("./src/omoospaceblender")
+
+# read by auto_load, keep in sync with auto_load.MANIFEST_NAME
+registration_manifest_name = "registration.json"
+
+# same as auto_load.get_register_base_types
+register_base_types = {
+    "Panel", "Operator", "PropertyGroup", "FileHandler",
+    "AddonPreferences", "Header", "Menu",
+    "Node", "NodeSocket", "NodeTree",
+    "UIList", "RenderEngine",
+    "Gizmo", "GizmoGroup",
+}
+
 
 def run_python(args: str):
     python = Path(sys.executable).resolve()
     subprocess.run([python] + args.split(" "))
 
 
+def iter_submodule_names(path: Path, root=""):
+    for _, module_name, is_package in pkgutil.iter_modules([str(path)]):
+        if is_package:
+            sub_root = root + module_name + "."
+            yield from iter_submodule_names(path / module_name, sub_root)
+        else:
+            yield root + module_name
+
+
+def resolve_import(module_name: str, node: ast.ImportFrom) -> str:
+    """Module name in the package of a relative `from . import`."""
+    parts = module_name.split(".")[: -node.level]
+    if node.module:
+        parts.append(node.module)
+    return ".".join(parts)
+
+
+def is_bpy_attribute(node: ast.expr, owner: str, names) -> bool:
+    """Whether node is `bpy.<owner>.<name>` with name in names."""
+    return (
+        isinstance(node, ast.Attribute)
+        and node.attr in names
+        and isinstance(node.value, ast.Attribute)
+        and node.value.attr == owner
+        and isinstance(node.value.value, ast.Name)
+        and node.value.value.id == "bpy"
+    )
+
+
+def read_registered_classes(module_name: str, tree: ast.Module) -> list[dict]:
+    """Classes of a module auto_load would register, read from its source."""
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level > 0:
+            for alias in node.names:
+                imported[alias.asname or alias.name] = (
+                    resolve_import(module_name, node),
+                    alias.name,
+                )
+
+    classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(
+            is_bpy_attribute(base, "types", register_base_types) for base in node.bases
+        ):
+            continue
+
+        info = {
+            "path": f"{module_name}:{node.name}",
+            "deps": [],
+            "bl_idname": None,
+            "bl_parent_id": None,
+        }
+        for item in node.body:
+            # PointerProperty(type=...) and CollectionProperty(type=...)
+            call = getattr(item, "annotation", None)
+            if isinstance(call, ast.Call) and is_bpy_attribute(
+                call.func, "props", {"PointerProperty", "CollectionProperty"}
+            ):
+                for keyword in call.keywords:
+                    if keyword.arg == "type" and isinstance(keyword.value, ast.Name):
+                        name = keyword.value.id
+                        module, name = imported.get(name, (module_name, name))
+                        info["deps"].append(f"{module}:{name}")
+
+            if isinstance(item, ast.Assign) and isinstance(item.value, ast.Constant):
+                for target in item.targets:
+                    if isinstance(target, ast.Name) and target.id in (
+                        "bl_idname",
+                        "bl_parent_id",
+                    ):
+                        info[target.id] = item.value.value
+
+        classes.append(info)
+
+    return classes
+
+
+def build_registration_manifest(package_dirpath: Path) -> dict:
+    """Registration order of the add-on, without importing it or bpy.
+
+    Modules are listed when they have classes to register or their own
+    register/unregister functions.
+    """
+    modules = []
+    classes = {}
+    for module_name in sorted(iter_submodule_names(package_dirpath)):
+        if module_name == "auto_load":
+            continue
+        filepath = package_dirpath.joinpath(*module_name.split(".")).with_suffix(".py")
+        tree = ast.parse(filepath.read_text(encoding="utf-8"))
+
+        module_classes = read_registered_classes(module_name, tree)
+        has_register = any(
+            isinstance(node, ast.FunctionDef)
+            and node.name in ("register", "unregister")
+            for node in tree.body
+        )
+        if module_classes or has_register:
+            modules.append(module_name)
+        for info in module_classes:
+            classes[info["path"]] = info
+
+    by_idname = {
+        info["bl_idname"]: path for path, info in classes.items() if info["bl_idname"]
+    }
+    deps_dict = {}
+    for path, info in classes.items():
+        deps = {dep for dep in info["deps"] if dep in classes}
+        if info["bl_parent_id"] in by_idname:
+            deps.add(by_idname[info["bl_parent_id"]])
+        deps_dict[path] = deps
+
+    return {"modules": modules, "classes": toposort(deps_dict)}
+
+
+def toposort(deps_dict: dict) -> list:
+    """Kahn's algorithm, ready items keep their order in deps_dict."""
+    dependents = {value: [] for value in deps_dict}
+    pending = {}
+    for value, deps in deps_dict.items():
+        pending[value] = len(deps)
+        for dep in deps:
+            dependents[dep].append(value)
+
+    ready = deque(value for value, count in pending.items() if count == 0)
+    sorted_list = []
+    while ready:
+        value = ready.popleft()
+        sorted_list.append(value)
+        for dependent in dependents[value]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if len(sorted_list) < len(deps_dict):
+        cycle = sorted(value for value, count in pending.items() if count > 0)
+        raise ValueError(f"Circular register dependencies: {', '.join(cycle)}")
+    return sorted_list
+
+
+def write_registration_manifest(package_dirpath: Path) -> Path:
+    manifest = build_registration_manifest(package_dirpath)
+    manifest_filepath = package_dirpath / registration_manifest_name
+    manifest_filepath.write_text(
+        json.dumps(manifest, indent=4) + "\n", encoding="utf-8"
+    )
+    return manifest_filepath
+
+
 def build_extension(platform: Platform, python_version="3.11") -> None:
-    wheel_dirpath = Path("./src/omoospaceblender/wheels")
-    toml_filepath = Path("./src/omoospaceblender/blender_manifest.toml")
+    wheel_dirpath = package_dirpath / "wheels"
+    toml_filepath = package_dirpath / "blender_manifest.toml"
+
+    # registration order, so auto_load does not reflect over every class at startup
+    write_registration_manifest(package_dirpath)
 
     # download required_packages
     run_python(
@@ -73,6 +246,11 @@ def build_extension(platform: Platform, python_version="3.11") -> None:
 
 def main():
     platform_name = sys.argv[1]
+    if platform_name == "manifest":
+        # only the registration manifest, e.g. to try it in dev mode
+        print(write_registration_manifest(package_dirpath))
+        return
+
     platform = platforms[platform_name]
     build_extension(platform)
 
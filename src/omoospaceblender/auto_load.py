@@ -1,8 +1,11 @@
 import bpy
+import os
+import json
 import typing
 import inspect
 import pkgutil
 import importlib
+from collections import deque
 from pathlib import Path
 
 __all__ = (
@@ -13,6 +16,11 @@ __all__ = (
 
 blender_version = bpy.app.version
 
+# written by build.py, see load_manifest
+MANIFEST_NAME = "registration.json"
+# reflect even if there is a manifest, and check that both agree
+DEV_MODE = bool(os.environ.get("OMOOSPACE_DEV"))
+
 modules = None
 ordered_classes = None
 
@@ -21,8 +29,21 @@ def init():
     global modules
     global ordered_classes
 
+    manifest = load_manifest()
+    if manifest is not None and not DEV_MODE:
+        try:
+            modules, ordered_classes = resolve_manifest(manifest)
+            return
+        except (ImportError, AttributeError, KeyError, ValueError) as e:
+            print(f"Registration manifest is stale, reflect instead: {e}")
+
     modules = get_all_submodules(Path(__file__).parent)
-    ordered_classes = get_ordered_classes_to_register(modules)
+    deps_dict = get_register_deps_dict(modules)
+    ordered_classes = toposort(deps_dict)
+
+    if manifest is not None:
+        for problem in check_manifest(manifest, modules, deps_dict):
+            print(f"Registration manifest disagrees with reflection: {problem}")
 
 
 def register():
@@ -75,6 +96,75 @@ def iter_submodule_names(path, root=""):
             yield root + module_name
 
 
+# Registration manifest
+#################################################
+
+def load_manifest():
+    try:
+        with open(Path(__file__).parent / MANIFEST_NAME, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def resolve_manifest(manifest):
+    manifest_modules = [
+        importlib.import_module("." + name, __package__)
+        for name in manifest["modules"]
+    ]
+
+    classes = []
+    for path in manifest["classes"]:
+        module_name, class_name = path.split(":")
+        module = importlib.import_module("." + module_name, __package__)
+        classes.append(getattr(module, class_name))
+    return manifest_modules, classes
+
+
+def get_module_path(module_name):
+    return module_name.removeprefix(__package__ + ".")
+
+
+def get_class_path(cls):
+    return f"{get_module_path(cls.__module__)}:{cls.__qualname__}"
+
+
+def check_manifest(manifest, modules, deps_dict):
+    """Differences between the manifest and what reflection found."""
+    problems = []
+
+    reflected_modules = {get_module_path(cls.__module__) for cls in deps_dict}
+    for module in modules:
+        if any(
+            inspect.isfunction(module.__dict__.get(name))
+            and module.__dict__[name].__module__ == module.__name__
+            for name in ("register", "unregister")
+        ):
+            reflected_modules.add(get_module_path(module.__name__))
+    reflected_modules.discard(get_module_path(__name__))
+
+    for name in sorted(reflected_modules - set(manifest["modules"])):
+        problems.append(f"module '{name}' is missing")
+    for name in sorted(set(manifest["modules"]) - reflected_modules):
+        problems.append(f"module '{name}' is not needed")
+
+    reflected_classes = {get_class_path(cls): cls for cls in deps_dict}
+    for path in sorted(reflected_classes.keys() - set(manifest["classes"])):
+        problems.append(f"class '{path}' is missing")
+    for path in sorted(set(manifest["classes"]) - reflected_classes.keys()):
+        problems.append(f"class '{path}' is not registered")
+
+    # every class after the classes it depends on
+    position = {path: index for index, path in enumerate(manifest["classes"])}
+    for path, cls in reflected_classes.items():
+        for dependency in deps_dict[cls]:
+            dependency_path = get_class_path(dependency)
+            if position.get(dependency_path, -1) > position.get(path, -1):
+                problems.append(f"class '{path}' comes before '{dependency_path}'")
+
+    return problems
+
+
 # Find classes to register
 #################################################
 
@@ -88,7 +178,8 @@ def get_register_deps_dict(modules):
         cls.bl_idname: cls for cls in my_classes if hasattr(cls, "bl_idname")}
 
     deps_dict = {}
-    for cls in my_classes:
+    # stable order, toposort keeps it for classes without dependencies
+    for cls in sorted(my_classes, key=get_class_path):
         deps_dict[cls] = set(iter_my_register_deps(
             cls, my_classes, my_classes_by_idname))
     return deps_dict
@@ -163,16 +254,25 @@ def get_register_base_types():
 #################################################
 
 def toposort(deps_dict):
+    # Kahn's algorithm, linear in classes and dependencies
+    dependents = {value: [] for value in deps_dict}
+    pending = {}
+    for value, deps in deps_dict.items():
+        pending[value] = len(deps)
+        for dep in deps:
+            dependents[dep].append(value)
+
+    ready = deque(value for value, count in pending.items() if count == 0)
     sorted_list = []
-    sorted_values = set()
-    while len(deps_dict) > 0:
-        unsorted = []
-        for value, deps in deps_dict.items():
-            if len(deps) == 0:
-                sorted_list.append(value)
-                sorted_values.add(value)
-            else:
-                unsorted.append(value)
-        deps_dict = {value: deps_dict[value] -
-                     sorted_values for value in unsorted}
+    while ready:
+        value = ready.popleft()
+        sorted_list.append(value)
+        for dependent in dependents[value]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if len(sorted_list) < len(deps_dict):
+        cycle = [value for value, count in pending.items() if count > 0]
+        raise ValueError(f"Circular register dependencies: {cycle}")
     return sorted_list
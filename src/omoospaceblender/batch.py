@@ -0,0 +1,283 @@
+"""Relocate the paths of every subspace file of an omoospace, headless.
+
+Usage:
+    blender -b --python-expr "import importlib; importlib.import_module('bl_ext.user_default.omoospaceblender.batch').main()" -- <omoospace> [--jobs 8] [--report report.json]
+
+Every `.blend` under the subspaces dir is opened by its own background
+Blender process, a pool keeps `--jobs` of them running. Inside each process
+the same rules as the Manage Input/Output Paths dialogs are applied to all
+paths that are not contents yet, then the file is saved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bpy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from multiprocessing.pool import ThreadPool
+from typing import TYPE_CHECKING
+
+from .manage_paths import render_paths
+from .path_index import (
+    collect_input_paths,
+    collect_output_paths,
+    invalidate_path_index,
+)
+from .utils import (
+    bpath_to_opath,
+    classify_contents,
+    copy_all,
+    get_omoospace,
+    get_sequence_source,
+    load_hash_index,
+    opath_to_bpath,
+    save_hash_index,
+    TRANSFER_STRATEGIES,
+    write_packed_files,
+)
+
+if TYPE_CHECKING:
+    from omoospace import Opath
+
+
+# Worker, runs inside each background Blender
+#################################################
+
+
+def relocate_current_file(
+    inputs: bool = True,
+    outputs: bool = True,
+    incremental: bool = True,
+    strategy: str = "COPY",
+    include_subspaces: bool = False,
+) -> dict:
+    """Move all non-content paths of current file into the contents dir.
+
+    Uses the defaults the dialogs would show, returns what changed. Other
+    subspace files, e.g. linked libraries, stay where they are unless
+    include_subspaces.
+    """
+    report = {"file": bpy.data.filepath, "changed": [], "failed": []}
+    # background sessions may have removed data without a depsgraph update
+    invalidate_path_index()
+
+    omoospace = get_omoospace()
+    if not omoospace:
+        report["error"] = "Not in an omoospace."
+        return report
+
+    if inputs:
+        records = list(collect_input_paths().values())
+        flags = classify_contents([record.path for record in records])
+        records = [record for record, is_content in zip(records, flags) if not is_content]
+        if not include_subspaces:
+            records = [
+                record
+                for record in records
+                if record.is_packed
+                or not omoospace.is_subspace(bpath_to_opath(record.path))
+            ]
+
+        jobs = []
+        transfers = []
+        for record, new_opath in zip(records, render_paths(records)):
+            include_folder = record.is_sequence and not record.is_packed
+            old_opath = bpath_to_opath(record.path)
+            new_bpath = opath_to_bpath(new_opath)
+
+            if record.is_packed:
+                try:
+                    write_packed_files(record.handle.owner, new_opath)
+                except Exception as err:
+                    report["failed"].append([record.parm, str(err)])
+                    continue
+                report["changed"].append([record.path, new_bpath])
+                record.set(new_bpath)
+                continue
+
+            if include_folder:
+                # only the frames of this sequence, not the whole folder
+                transfers.append((get_sequence_source(old_opath), new_opath.parent))
+            else:
+                transfers.append((old_opath, new_opath.parent))
+            jobs.append((record, new_bpath))
+
+        contents_dir = omoospace.contents_dir
+        hash_index = load_hash_index(contents_dir) if incremental else None
+        copies = copy_all(
+            transfers, incremental=incremental, hash_index=hash_index, strategy=strategy
+        )
+        for index, err in copies:
+            record, new_bpath = jobs[index]
+            if err:
+                report["failed"].append([record.parm, str(err)])
+                continue
+            report["changed"].append([record.path, new_bpath])
+            record.set(new_bpath)
+
+        if hash_index:
+            save_hash_index(contents_dir, hash_index)
+
+    if outputs:
+        records = list(collect_output_paths().values())
+        flags = classify_contents([record.path for record in records])
+        records = [record for record, is_content in zip(records, flags) if not is_content]
+        for record, new_opath in zip(records, render_paths(records)):
+            new_bpath = opath_to_bpath(new_opath)
+            report["changed"].append([record.path, new_bpath])
+            record.set(new_bpath)
+
+    return report
+
+
+def relocate_worker(report_path: str, options: dict):
+    """Entry point of the background processes, see `relocate_file`."""
+    try:
+        report = relocate_current_file(**options)
+        if report["changed"]:
+            bpy.ops.wm.save_mainfile()
+    except Exception as err:
+        report = {"file": bpy.data.filepath, "error": str(err)}
+
+    with open(report_path, "w", encoding="utf-8") as file:
+        json.dump(report, file)
+
+
+# Driver
+#################################################
+
+
+def relocate_file(blend_file: Opath, options: dict, blender: str = None) -> dict:
+    """Relocate one file in its own background Blender, return its report."""
+    fd, report_path = tempfile.mkstemp(prefix="omoospace_relocate_", suffix=".json")
+    os.close(fd)
+
+    expr = (
+        "import importlib; "
+        f"importlib.import_module({__name__!r}).relocate_worker({report_path!r}, {options!r})"
+    )
+    command = [
+        blender or bpy.app.binary_path,
+        "-b",
+        "-noaudio",
+        str(blend_file),
+        "--python-exit-code",
+        "1",
+        "--python-expr",
+        expr,
+    ]
+
+    try:
+        process = subprocess.run(command, capture_output=True, text=True)
+        try:
+            with open(report_path, encoding="utf-8") as file:
+                report = json.load(file)
+        except (OSError, ValueError):
+            output = (process.stderr or process.stdout).strip().splitlines()
+            report = {
+                "file": str(blend_file),
+                "error": output[-1] if output else f"exit code {process.returncode}",
+            }
+    finally:
+        os.remove(report_path)
+
+    return report
+
+
+def relocate_omoospace(
+    root, jobs: int = None, blender: str = None, **options
+) -> list[dict]:
+    """Relocate every subspace file of the omoospace at root."""
+    from omoospace import Omoospace
+
+    if options.get("strategy") == "MOVE":
+        raise ValueError("MOVE is not supported, files share sources.")
+
+    omoospace = Omoospace(root)
+    blend_files = sorted(omoospace.subspaces_dir.rglob("*.blend"))
+    jobs = jobs or os.cpu_count() or 1
+
+    # the real work happens in other processes, threads only wait for them
+    reports = []
+    with ThreadPool(min(jobs, len(blend_files)) or 1) as pool:
+        results = pool.imap_unordered(
+            lambda blend_file: relocate_file(blend_file, options, blender),
+            blend_files,
+        )
+        for done, report in enumerate(results, 1):
+            reports.append(report)
+            print(f"[{done}/{len(blend_files)}] {format_report(report)}")
+
+    return sorted(reports, key=lambda report: report["file"])
+
+
+def format_report(report: dict) -> str:
+    if report.get("error"):
+        return f"{report['file']}: error, {report['error']}"
+    return (
+        f"{report['file']}: {len(report['changed'])} changed, "
+        f"{len(report['failed'])} failed"
+    )
+
+
+def main(argv: list[str] = None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog="omoospace relocate", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("omoospace", help="Any path inside the omoospace")
+    parser.add_argument("--jobs", type=int, help="Blender processes at once")
+    parser.add_argument("--no-inputs", action="store_true")
+    parser.add_argument("--no-outputs", action="store_true")
+    parser.add_argument(
+        "--full-copy", action="store_true", help="Copy every file, not only changed ones"
+    )
+    parser.add_argument(
+        "--strategy",
+        # files run in parallel and share sources, a move breaks the others
+        choices=[name for name, _, _ in TRANSFER_STRATEGIES if name != "MOVE"],
+        default="COPY",
+        help="How files are put into the contents dir, MOVE is not supported",
+    )
+    parser.add_argument(
+        "--include-subspaces",
+        action="store_true",
+        help="Also copy inputs that are subspace files, e.g. linked libraries",
+    )
+    parser.add_argument("--report", help="Also write all reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    reports = relocate_omoospace(
+        args.omoospace,
+        jobs=args.jobs,
+        inputs=not args.no_inputs,
+        outputs=not args.no_outputs,
+        incremental=not args.full_copy,
+        strategy=args.strategy,
+        include_subspaces=args.include_subspaces,
+    )
+
+    changed = sum(len(report.get("changed", ())) for report in reports)
+    failed = sum(len(report.get("failed", ())) for report in reports)
+    errors = [report for report in reports if report.get("error")]
+
+    print()
+    for report in reports:
+        for parm, err in report.get("failed", ()):
+            print(f"{report['file']}: fail '{parm}': {err}")
+    for report in errors:
+        print(format_report(report))
+    print(
+        f"{len(reports)} files, {changed} paths changed, "
+        f"{failed} paths failed, {len(errors)} files with errors"
+    )
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(reports, file, indent=4)
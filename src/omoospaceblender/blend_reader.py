@@ -0,0 +1,575 @@
+"""Read the paths of .blend files without Blender.
+
+Only the block headers and the few structs holding paths are read, the file
+is memory mapped. Records have the same shape as `collect_input_paths` and
+`collect_output_paths`, but no handle, they can not be set.
+
+Usage:
+    python src/omoospaceblender/blend_reader.py Subspaces/ [--json paths.json]
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+
+try:
+    from .path_records import (
+        InputPathRecord,
+        OutputPathRecord,
+        is_sequence_name,
+        video_format,
+    )
+except ImportError:
+    # run as a script, without the add-on (and bpy) around
+    from path_records import (
+        InputPathRecord,
+        OutputPathRecord,
+        is_sequence_name,
+        video_format,
+    )
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# R_IMF_IMTYPE_AVIRAW, R_IMF_IMTYPE_AVIJPEG, R_IMF_IMTYPE_FFMPEG
+VIDEO_IMTYPES = (15, 16, 24)
+
+SEQ_TYPE_IMAGE = 0
+SEQ_TYPE_META = 1
+SEQ_TYPE_MOVIE = 3
+
+PRIMITIVES = {
+    "char": "b",
+    "uchar": "B",
+    "short": "h",
+    "ushort": "H",
+    "int": "i",
+    "uint": "I",
+    "float": "f",
+    "double": "d",
+    "int8_t": "b",
+    "uint8_t": "B",
+    "int16_t": "h",
+    "uint16_t": "H",
+    "int32_t": "i",
+    "uint32_t": "I",
+    "int64_t": "q",
+    "uint64_t": "Q",
+}
+
+FIELD_NAME = re.compile(r"[(*]*(\w+)")
+FIELD_DIMS = re.compile(r"\[(\d+)\]")
+
+
+class Field:
+    __slots__ = ("type", "offset", "count", "is_pointer")
+
+    def __init__(self, type: str, offset: int, count: int, is_pointer: bool):
+        self.type = type
+        self.offset = offset
+        self.count = count
+        self.is_pointer = is_pointer
+
+
+class Struct:
+    __slots__ = ("name", "fields")
+
+    def __init__(self, name: str, fields: dict[str, Field]):
+        self.name = name
+        self.fields = fields
+
+
+class Block:
+    __slots__ = ("code", "offset", "size", "address", "sdna")
+
+    def __init__(self, code: bytes, offset: int, size: int, address: int, sdna: int):
+        self.code = code
+        self.offset = offset
+        self.size = size
+        self.address = address
+        self.sdna = sdna
+
+
+class Instance:
+    """A struct in the file, fields are only read when asked for."""
+
+    __slots__ = ("blend", "struct", "offset")
+
+    def __init__(self, blend: "BlendFile", struct: Struct, offset: int):
+        self.blend = blend
+        self.struct = struct
+        self.offset = offset
+
+    def has(self, name: str) -> bool:
+        return name in self.struct.fields
+
+    def get(self, path: str, default=None):
+        """Read a field, nested fields are separated by dots, e.g. "id.name"."""
+        struct, offset = self.struct, self.offset
+        *parents, name = path.split(".")
+        for parent in parents:
+            field = struct.fields.get(parent)
+            if field is None or field.is_pointer:
+                return default
+            struct, offset = self.blend.structs[field.type], offset + field.offset
+
+        field = struct.fields.get(name)
+        if field is None:
+            return default
+        return self.blend.read_field(field, offset + field.offset)
+
+    def first(self, names: tuple[str, ...], default=None):
+        """Read the first existing field, for fields renamed across versions."""
+        for name in names:
+            if self.has(name):
+                return self.get(name)
+        return default
+
+
+class BlendFile:
+    """Memory mapped .blend file, parses only block headers and the DNA."""
+
+    def __init__(self, filepath):
+        self.filepath = str(filepath)
+        with open(filepath, "rb") as file:
+            magic = file.read(4)
+            file.seek(0)
+            if magic[:2] == GZIP_MAGIC:
+                self.data = gzip.decompress(file.read())
+            elif magic == ZSTD_MAGIC:
+                self.data = decompress_zstd(file)
+            elif magic == b"BLEN":
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                raise ValueError(f"Not a .blend file: '{filepath}'")
+
+        self.blocks: list[Block] = []
+        self.blocks_by_address: dict[int, Block] = {}
+        self.structs: dict[str, Struct] = {}
+        self.structs_by_index: list[Struct] = []
+
+        self.parse_header()
+        self.parse_blocks()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def parse_header(self):
+        data = self.data
+        if data[:7] != b"BLENDER":
+            raise ValueError(f"Not a .blend file: '{self.filepath}'")
+
+        if data[7:9].isdigit():
+            # 5.0+, e.g. "BLENDER17-01v0500", always 64 bit bheads
+            self.header_size = int(data[7:9])
+            self.pointer_size = 8
+            endian = data[12:13]
+            self.version = int(data[13:17])
+            bhead = "4siQqq"
+        else:
+            # e.g. "BLENDER-v402"
+            self.header_size = 12
+            self.pointer_size = 4 if data[7:8] == b"_" else 8
+            endian = data[8:9]
+            self.version = int(data[9:12])
+            bhead = "4siIii" if self.pointer_size == 4 else "4siQii"
+
+        self.endian = "<" if endian == b"v" else ">"
+        self.bhead = struct.Struct(self.endian + bhead)
+        self.large_bhead = self.header_size != 12
+        self.pointer_format = self.endian + ("I" if self.pointer_size == 4 else "Q")
+
+    def parse_blocks(self):
+        data = self.data
+        bhead = self.bhead
+        offset = self.header_size
+        while offset + bhead.size <= len(data):
+            if self.large_bhead:
+                code, sdna, address, size, _ = bhead.unpack_from(data, offset)
+            else:
+                code, size, address, sdna, _ = bhead.unpack_from(data, offset)
+            offset += bhead.size
+            code = code.rstrip(b"\0")
+
+            if code == b"ENDB":
+                break
+            if code == b"DNA1":
+                self.parse_dna(offset)
+            else:
+                block = Block(code, offset, size, address, sdna)
+                self.blocks.append(block)
+                self.blocks_by_address[address] = block
+
+            offset += size
+
+    def parse_dna(self, start: int):
+        data = self.data
+        int_format = self.endian + "i"
+        offset = start + 4  # "SDNA"
+
+        def align(offset: int) -> int:
+            return start + ((offset - start + 3) & ~3)
+
+        def read_strings(offset: int) -> tuple[list[str], int]:
+            (count,) = struct.unpack_from(int_format, data, offset + 4)
+            offset += 8
+            strings = []
+            for _ in range(count):
+                end = data.find(b"\0", offset)
+                strings.append(data[offset:end].decode("ascii"))
+                offset = end + 1
+            return strings, align(offset)
+
+        names, offset = read_strings(offset)  # "NAME"
+        types, offset = read_strings(offset)  # "TYPE"
+
+        # "TLEN"
+        lengths = struct.unpack_from(f"{self.endian}{len(types)}h", data, offset + 4)
+        offset = align(offset + 4 + 2 * len(types))
+
+        # "STRC"
+        (count,) = struct.unpack_from(int_format, data, offset + 4)
+        offset += 8
+        short_format = self.endian + "hh"
+        for _ in range(count):
+            type_index, field_count = struct.unpack_from(short_format, data, offset)
+            offset += 4
+
+            fields = {}
+            field_offset = 0
+            for _ in range(field_count):
+                field_type, field_name = struct.unpack_from(short_format, data, offset)
+                offset += 4
+
+                name = names[field_name]
+                is_pointer = name.startswith(("*", "(*"))
+                dims = 1
+                for dim in FIELD_DIMS.findall(name):
+                    dims *= int(dim)
+
+                type_name = types[field_type]
+                fields[FIELD_NAME.match(name).group(1)] = Field(
+                    type_name, field_offset, dims, is_pointer
+                )
+                size = self.pointer_size if is_pointer else lengths[field_type]
+                field_offset += size * dims
+
+            struct_ = Struct(types[type_index], fields)
+            self.structs[struct_.name] = struct_
+            self.structs_by_index.append(struct_)
+
+    def read_field(self, field: Field, offset: int):
+        data = self.data
+        if field.is_pointer:
+            return struct.unpack_from(self.pointer_format, data, offset)[0]
+
+        if field.type == "char" and field.count > 1:
+            return self.read_string(offset, field.count)
+
+        primitive = PRIMITIVES.get(field.type)
+        if primitive is None:
+            return Instance(self, self.structs[field.type], offset)
+
+        values = struct.unpack_from(f"{self.endian}{field.count}{primitive}", data, offset)
+        return values[0] if field.count == 1 else values
+
+    def read_string(self, offset: int, size: int) -> str:
+        end = self.data.find(b"\0", offset, offset + size)
+        if end == -1:
+            end = offset + size
+        return self.data[offset:end].decode("utf-8", errors="replace")
+
+    def deref(self, address: int) -> Instance:
+        """The struct a pointer points to, None for null or unknown pointers."""
+        block = self.blocks_by_address.get(address) if address else None
+        if block is None:
+            return None
+        return Instance(self, self.structs_by_index[block.sdna], block.offset)
+
+    def deref_string(self, address: int) -> str:
+        """Read a `char *` field, e.g. NodesModifierData.simulation_bake_directory."""
+        block = self.blocks_by_address.get(address) if address else None
+        if block is None:
+            return ""
+        return self.read_string(block.offset, block.size)
+
+    def iter_list(self, first: int):
+        """Walk a ListBase from its first pointer."""
+        seen = set()
+        while first and first not in seen:
+            seen.add(first)
+            item = self.deref(first)
+            if item is None:
+                return
+            yield item
+            first = item.get("next")
+
+    def iter_ids(self, code: bytes):
+        for block in self.blocks:
+            if block.code == code:
+                yield Instance(self, self.structs_by_index[block.sdna], block.offset)
+
+
+def decompress_zstd(file) -> bytes:
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(
+            f"'{file.name}' is compressed with zstd, install 'zstandard' to read it"
+        )
+
+    decompressor = zstandard.ZstdDecompressor()
+    with decompressor.stream_reader(file, read_across_frames=True) as reader:
+        return reader.read()
+
+
+def get_id_name(id: Instance) -> str:
+    # e.g. "IMwood.png", the first two chars are the ID code
+    return id.get("id.name")[2:]
+
+
+def is_id_packed(id: Instance) -> bool:
+    return bool(id.get("packedfile") or id.get("packedfiles.first"))
+
+
+def iter_strips(blend: BlendFile, first: int):
+    """Like `sequence_editor.strips_all`, meta strips are walked into."""
+    for strip in blend.iter_list(first):
+        yield strip
+        if strip.get("type") == SEQ_TYPE_META:
+            yield from iter_strips(blend, strip.get("seqbase.first"))
+
+
+def read_blend_paths(
+    filepath,
+) -> tuple[dict[str, InputPathRecord], dict[str, OutputPathRecord]]:
+    """Input and output paths of a .blend file, keyed by parm."""
+    from omoospace import normalize_name
+
+    inputs: dict[str, InputPathRecord] = {}
+    outputs: dict[str, OutputPathRecord] = {}
+
+    def add_input(parm: str, **kwargs):
+        inputs[parm] = InputPathRecord(parm, None, **kwargs)
+
+    def add_output(parm: str, **kwargs):
+        outputs[parm] = OutputPathRecord(parm, None, **kwargs)
+
+    with BlendFile(filepath) as blend:
+        for image in blend.iter_ids(b"IM"):
+            path = image.first(("filepath", "name"))
+            if not path:
+                continue
+
+            name = get_id_name(image)
+            add_input(
+                f"bpy.data.images['{name}'].filepath",
+                label=name,
+                path=path,
+                users=image.get("id.us"),
+                category="Videos" if path.endswith(video_format) else "Images",
+                is_sequence=is_sequence_name(path),
+                is_packed=is_id_packed(image),
+            )
+
+        for sound in blend.iter_ids(b"SO"):
+            path = sound.first(("filepath", "name"))
+            if not path:
+                continue
+
+            name = get_id_name(sound)
+            add_input(
+                f"bpy.data.sounds['{name}'].filepath",
+                label=name,
+                path=path,
+                users=sound.get("id.us"),
+                category="Videos" if path.endswith(video_format) else "Audios",
+                is_sequence=False,
+                is_packed=is_id_packed(sound),
+            )
+
+        for volume in blend.iter_ids(b"VO"):
+            path = volume.get("filepath")
+            if not path:
+                continue
+
+            name = get_id_name(volume)
+            add_input(
+                f"bpy.data.volumes['{name}'].filepath",
+                label=name,
+                path=path,
+                users=volume.get("id.us"),
+                category="Volumes",
+                is_sequence=bool(volume.get("is_sequence")),
+                is_packed=is_id_packed(volume),
+            )
+
+        for cache_file in blend.iter_ids(b"CF"):
+            path = cache_file.get("filepath")
+            if not path:
+                continue
+
+            name = get_id_name(cache_file)
+            add_input(
+                f"bpy.data.cache_files['{name}'].filepath",
+                label=name,
+                path=path,
+                users=cache_file.get("id.us"),
+                category="Dynamics",
+                is_sequence=is_sequence_name(path),
+                is_packed=False,
+            )
+
+        for library in blend.iter_ids(b"LI"):
+            path = library.first(("filepath", "name"))
+            if not path:
+                continue
+
+            if path == "<startup.blend>" or path.endswith("startup.blend"):
+                continue
+
+            name = get_id_name(library)
+            add_input(
+                f"bpy.data.libraries['{name}'].filepath",
+                label=name,
+                path=path,
+                users=library.get("id.us"),
+                category="Libraries",
+                is_sequence=False,
+                is_packed=is_id_packed(library),
+            )
+
+        for scene in blend.iter_ids(b"SC"):
+            scene_name = get_id_name(scene)
+            not_video = scene.get("r.im_format.imtype") not in VIDEO_IMTYPES
+
+            add_output(
+                f"bpy.data.scenes['{scene_name}'].render.filepath",
+                label=scene_name,
+                path=scene.get("r.pic"),
+                category="Renders",
+                name=normalize_name(scene_name),
+                suffix="####" if not_video else "",
+                in_folder=not_video,
+            )
+
+            editing = blend.deref(scene.get("ed"))
+            if editing is None:
+                continue
+
+            for strip in iter_strips(blend, editing.get("seqbase.first")):
+                strip_type = strip.get("type")
+                if strip_type not in (SEQ_TYPE_IMAGE, SEQ_TYPE_MOVIE):
+                    continue
+
+                strip_data = blend.deref(strip.first(("strip", "data")))
+                if strip_data is None:
+                    continue
+
+                path = strip_data.get("dir")
+                if strip_type == SEQ_TYPE_IMAGE:
+                    category = "Images"
+                    attr = "directory"
+                else:
+                    category = "Videos"
+                    attr = "filepath"
+                    element = blend.deref(strip_data.get("stripdata"))
+                    if element is not None:
+                        path = os.path.join(path, element.get("name"))
+
+                strip_name = strip.get("name")[2:]
+                add_input(
+                    f"bpy.data.scenes['{scene_name}'].sequence_editor.strips_all['{strip_name}'].{attr}",
+                    label=strip_name,
+                    path=path,
+                    users=0,
+                    category=category,
+                    is_sequence=False,
+                    is_packed=False,
+                )
+
+        for obj in blend.iter_ids(b"OB"):
+            obj_name = get_id_name(obj)
+            for modifier in blend.iter_list(obj.get("modifiers.first")):
+                if modifier.struct.name != "NodesModifierData":
+                    continue
+                # bake_directory in RNA, simulation_bake_directory in DNA
+                bake_directory = modifier.first(
+                    ("bake_directory", "simulation_bake_directory")
+                )
+                if bake_directory is None:
+                    continue
+
+                modifier_name = modifier.get("modifier.name")
+                add_output(
+                    f"bpy.data.objects['{obj_name}'].modifiers['{modifier_name}'].bake_directory",
+                    label=f"{obj_name} {modifier_name}",
+                    path=blend.deref_string(bake_directory),
+                    category="GeometryNodes",
+                    name=normalize_name(modifier_name),
+                    suffix="",
+                    in_folder=False,
+                )
+
+    return inputs, outputs
+
+
+def record_to_dict(record) -> dict:
+    return {name: getattr(record, name) for name in record.__slots__ if name != "handle"}
+
+
+def iter_blend_files(paths: list[str]):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.rglob("*.blend"))
+        else:
+            yield path
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help=".blend files or folders")
+    parser.add_argument("--json", help="Write all records to this file")
+    args = parser.parse_args(argv)
+
+    result = {}
+    failed = 0
+    for blend_file in iter_blend_files(args.paths):
+        try:
+            inputs, outputs = read_blend_paths(blend_file)
+        except (OSError, ValueError, struct.error) as err:
+            failed += 1
+            print(f"{blend_file}: fail to read, {err}", file=sys.stderr)
+            continue
+
+        print(blend_file)
+        for record in (*inputs.values(), *outputs.values()):
+            print(f"    {record.parm}: {record.path}")
+
+        result[str(blend_file)] = {
+            "inputs": [record_to_dict(record) for record in inputs.values()],
+            "outputs": [record_to_dict(record) for record in outputs.values()],
+        }
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=4)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
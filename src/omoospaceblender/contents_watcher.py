@@ -0,0 +1,171 @@
+import bpy
+import os
+
+from .profiling import stage
+from .utils import get_omoospace
+
+POLL_INTERVAL = 2.0
+
+# normalized contents dir being watched
+_root: str = None
+# normalized paths of every file and folder under _root
+_existing: set[str] = set()
+# folder -> st_mtime_ns when it was last listed
+_dir_mtimes: dict[str, int] = {}
+# folder -> its direct entries
+_children: dict[str, set[str]] = {}
+# open dialogs showing the listing, polled only while there is one
+_holders = 0
+
+
+def normalize_path(path) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(str(path))))
+
+
+def forget_dir(dir: str):
+    _dir_mtimes.pop(dir, None)
+    _existing.discard(dir)
+    for path in _children.pop(dir, ()):
+        _existing.discard(path)
+        if path in _children:
+            forget_dir(path)
+
+
+def scan_dir(dir: str):
+    """List one folder again, new subfolders are scanned recursively."""
+    try:
+        mtime = os.stat(dir).st_mtime_ns
+        with os.scandir(dir) as entries:
+            entries = list(entries)
+    except OSError:
+        forget_dir(dir)
+        return
+
+    _dir_mtimes[dir] = mtime
+
+    paths = set()
+    subdirs = []
+    for entry in entries:
+        path = os.path.normcase(entry.path)
+        paths.add(path)
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(path)
+
+    for path in _children.get(dir, set()) - paths:
+        _existing.discard(path)
+        if path in _children:
+            forget_dir(path)
+
+    _existing.update(paths)
+    _children[dir] = paths
+
+    for subdir in subdirs:
+        if subdir not in _dir_mtimes:
+            scan_dir(subdir)
+
+
+def poll_contents() -> bool:
+    """Rescan folders whose mtime changed, returns whether any did.
+
+    Only one stat per known folder, files are never touched.
+    """
+    if _root is None:
+        return False
+
+    if _root not in _dir_mtimes:
+        # contents dir does not exist yet, or first poll
+        if not os.path.isdir(_root):
+            return False
+        scan_dir(_root)
+        return True
+
+    changed = False
+    for dir, mtime in list(_dir_mtimes.items()):
+        # may be forgotten by a rescan of its parent in this loop
+        if dir not in _dir_mtimes:
+            continue
+        try:
+            current = os.stat(dir).st_mtime_ns
+        except OSError:
+            current = None
+        if current != mtime:
+            scan_dir(dir)
+            changed = True
+
+    return changed
+
+
+def is_watching(path: str = None) -> bool:
+    """Whether the contents dir is scanned, and path (normalized) is under it."""
+    if _root not in _dir_mtimes:
+        return False
+    if path is None:
+        return True
+    return path == _root or path.startswith(_root.rstrip(os.sep) + os.sep)
+
+
+def path_exists(path) -> bool:
+    """Look the path up in memory when it is under the contents dir.
+
+    Other paths, or any path before the first scan, are checked on disk.
+    """
+    path = normalize_path(path)
+    if is_watching(path):
+        return path == _root or path in _existing
+    return os.path.exists(path)
+
+
+def watch_poll():
+    if _root is None or not _holders:
+        return None
+    with stage("watch_contents"):
+        poll_contents()
+    return POLL_INTERVAL
+
+
+def hold_contents():
+    """Poll the contents dir while a dialog shows it, see release_contents."""
+    global _holders
+    _holders += 1
+    # pick up changes since the dialog was last open
+    poll_contents()
+    if _root is not None and not bpy.app.timers.is_registered(watch_poll):
+        bpy.app.timers.register(watch_poll, first_interval=POLL_INTERVAL)
+
+
+def release_contents():
+    global _holders
+    _holders = max(_holders - 1, 0)
+    if not _holders and bpy.app.timers.is_registered(watch_poll):
+        bpy.app.timers.unregister(watch_poll)
+
+
+def watch_contents():
+    """Watch the contents dir of current omoospace, stop if there is none.
+
+    Nothing is scanned here, only when a dialog or report needs it, see
+    poll_contents and hold_contents.
+    """
+    global _root
+    omoospace = get_omoospace()
+    root = normalize_path(omoospace.contents_dir.resolve()) if omoospace else None
+    if root == _root:
+        return
+
+    stop_watching_contents()
+    _root = root
+
+
+def stop_watching_contents():
+    global _root, _holders
+    _root = None
+    _holders = 0
+    _existing.clear()
+    _dir_mtimes.clear()
+    _children.clear()
+    if bpy.app.timers.is_registered(watch_poll):
+        bpy.app.timers.unregister(watch_poll)
+
+
+def unregister():
+    stop_watching_contents()
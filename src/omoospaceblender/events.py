@@ -5,11 +5,21 @@ from pathlib import Path
 from .manage_paths import (
     correct_path_on_save_pre,
     restore_path_on_save_post,
+    store_path_fingerprint_on_save_pre,
     correct_path_on_load_post,
 )
-from .utils import get_omoospace
+from .contents_watcher import watch_contents
+from .path_index import invalidate_path_index
+from .profiling import profiled
+from .transfers import (
+    forget_transfer_paths,
+    has_pending_transfers,
+    start_watching_transfers,
+)
+from .utils import clear_omoospace_cache, get_omoospace, subspace_data
 
 
+@profiled
 def update_quick_dirs():
     omoospace = get_omoospace()
     if not omoospace:
@@ -42,29 +52,68 @@ def update_quick_dirs():
 
 
 @persistent
+def on_load_pre(dummy):
+    # queued transfers refer to datablocks of the file being closed
+    forget_transfer_paths()
+
+
+@persistent
+@profiled
 def on_load_post(dummy):
+    clear_omoospace_cache()
+    invalidate_path_index()
+    subspace_data.load()
     update_quick_dirs()
     correct_path_on_load_post()
+    watch_contents()
+    if has_pending_transfers():
+        # transfers queued by the previous file still need to be collected
+        start_watching_transfers()
 
 
 @persistent
+@profiled
 def on_save_post(blend_file: str):
+    clear_omoospace_cache()
     update_quick_dirs()
     restore_path_on_save_post(blend_file)
+    invalidate_path_index()
+    watch_contents()
+    if has_pending_transfers():
+        start_watching_transfers()
+
+
+@persistent
+def on_data_changed(*args):
+    # paths may have changed, rebuild the index on next use
+    invalidate_path_index()
 
 
 @persistent
+@profiled
 def on_save_pre(blend_file: str):
+    # a script may have set paths without a depsgraph update since
+    invalidate_path_index()
     correct_path_on_save_pre(blend_file)
+    store_path_fingerprint_on_save_pre(blend_file)
+    subspace_data.flush()
 
 
 def register():
+    bpy.app.handlers.load_pre.append(on_load_pre)
     bpy.app.handlers.load_post.append(on_load_post)
     bpy.app.handlers.save_pre.append(on_save_pre)
     bpy.app.handlers.save_post.append(on_save_post)
+    bpy.app.handlers.depsgraph_update_post.append(on_data_changed)
+    bpy.app.handlers.undo_post.append(on_data_changed)
+    bpy.app.handlers.redo_post.append(on_data_changed)
 
 
 def unregister():
+    bpy.app.handlers.load_pre.remove(on_load_pre)
     bpy.app.handlers.load_post.remove(on_load_post)
     bpy.app.handlers.save_pre.remove(on_save_pre)
     bpy.app.handlers.save_post.remove(on_save_post)
+    bpy.app.handlers.depsgraph_update_post.remove(on_data_changed)
+    bpy.app.handlers.undo_post.remove(on_data_changed)
+    bpy.app.handlers.redo_post.remove(on_data_changed)
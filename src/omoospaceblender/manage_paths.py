@@ -1,21 +1,58 @@
 import bpy
+import math
+import os
+import sqlite3
 from pathlib import Path
-
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, NamedTuple
+
+from .contents_watcher import (
+    hold_contents,
+    path_exists,
+    poll_contents,
+    release_contents,
+)
 from .operators import RevealPath
 from .utils import (
+    apply_paths,
     bpath_to_opath,
+    classify_contents,
+    copy_all,
     copy_to,
+    format_size,
+    get_duplicate_size,
     get_omoospace,
-    get_pathname,
+    get_path_renderer,
+    get_sequence_source,
     get_subspace_data,
-    get_type,
+    get_transfer_key,
     is_content,
-    is_sequence,
+    KEEP_SOURCE_STRATEGIES,
+    load_hash_index,
     opath_to_bpath,
+    PathHandle,
+    save_hash_index,
     set_subspace_data,
+    TRANSFER_STRATEGIES,
+    UDIM_TOKEN,
+    write_packed_files,
 )
+from .path_index import (
+    collect_input_paths,
+    collect_output_paths,
+    get_path_fingerprint,
+    invalidate_path_index,
+    iter_paths,
+    InputPathRecord,
+    OutputPathRecord,
+)
+from .profiling import profiled, stage
+from .transfers import queue_transfer
+from .usage_index import USAGE_INDEX, UsageIndex, get_content_key, get_input_usage
 from .props import OMOOSPACE_InputPath, OMOOSPACE_OutputPath, OMOOSPACE_OldPath
-from omoospace import normalize_name, Opath, Omoospace
+
+if TYPE_CHECKING:
+    from omoospace import Opath
 
 CATEGORY_ICON = {
     "Images": "IMAGE_DATA",
@@ -31,237 +68,97 @@ CATEGORY_ICON = {
 
 
 def correct_input_path(
-    input_path: Opath,
+    input_path: "Opath",
     category="Misc",
     folder="",
     include_folder=False,
     include_pathname=False,
-) -> Opath:
-    omoospace = get_omoospace()
-    main_folder = omoospace.contents_dir
-
-    end_name = (
-        f"{input_path.parent.name}/{input_path.name}"
-        if include_folder
-        else input_path.name
+) -> "Opath":
+    return get_path_renderer().input_path(
+        input_path,
+        category=category,
+        folder=folder,
+        include_folder=include_folder,
+        include_pathname=include_pathname,
     )
 
-    if include_pathname:
-        pathname = get_pathname()
-        folder = f"{pathname}_{folder}" if folder else pathname
-
-    if folder:
-        new_path = main_folder / category / folder / end_name
-    else:
-        new_path = main_folder / category / end_name
-
-    return new_path
-
 
 def correct_output_path(name, in_folder=False, category="Misc", suffix=""):
+    return get_path_renderer().output_path(
+        name, in_folder=in_folder, category=category, suffix=suffix
+    )
 
-    omoospace = get_omoospace()
-    pathname = get_pathname()
-    main_folder = omoospace.contents_dir
-
-    suffix.removeprefix(".")
-    name = f"{pathname}_{name}" if name else pathname
-    filename = f"{name}.{suffix}" if suffix else name
-
-    if in_folder:
-        new_path = main_folder / category / name / filename
-    else:
-        new_path = main_folder / category / filename
-
-    return new_path
-
-
-video_format = (
-    ".mp4",
-    ".mov",
-    ".avi",
-    ".mkv",
-    ".wmv",
-    ".flv",
-    ".webm",
-)
-
-
-def collect_input_paths():
-    input_path_dict = {}
-
-    # TODO: 是否应该包括要那些没有在使用的资源？
-    for image in bpy.data.images:
-        if not image.filepath:
-            continue
-
-        parm = f"bpy.data.images['{image.name}'].filepath"
-        input_path_dict[parm] = {
-            "label": image.name,
-            "path": image.filepath,
-            "users": image.users,
-            "category": "Videos" if image.filepath.endswith(video_format) else "Images",
-            "is_sequence": is_sequence(image.filepath),
-            "is_packed": bool(image.packed_file),
-        }
-
-    for sound in bpy.data.sounds:
-        if not sound.filepath:
-            continue
-
-        parm = f"bpy.data.sounds['{sound.name}'].filepath"
-        input_path_dict[parm] = {
-            "label": sound.name,
-            "path": sound.filepath,
-            "users": sound.users,
-            "category": "Videos" if sound.filepath.endswith(video_format) else "Audios",
-            "is_sequence": False,
-            "is_packed": bool(sound.packed_file),
-        }
 
-    for volume in bpy.data.volumes:
-        if not volume.filepath:
-            continue
+def render_paths(records) -> "list[Opath]":
+    """New paths of input/output records or dialog rows, in one batch.
 
-        parm = f"bpy.data.volumes['{volume.name}'].filepath"
-        input_path_dict[parm] = {
-            "label": volume.name,
-            "path": volume.filepath,
-            "users": volume.users,
-            "category": "Volumes",
-            "is_sequence": volume.is_sequence,
-            "is_packed": bool(volume.packed_file),
-        }
+    Omoospace, pathname and templates are looked up once. Input records
+    without dialog options get what the dialog would show by default.
+    """
+    renderer = get_path_renderer()
 
-    for cache_file in bpy.data.cache_files:
-        if not cache_file.filepath:
-            continue
-
-        parm = f"bpy.data.cache_files['{cache_file.name}'].filepath"
-        input_path_dict[parm] = {
-            "label": cache_file.name,
-            "path": cache_file.filepath,
-            "users": cache_file.users,
-            "category": "Dynamics",
-            "is_sequence": is_sequence(cache_file.filepath),
-            "is_packed": False,
-        }
-
-    for library in bpy.data.libraries:
-        if not library.filepath:
-            continue
+    new_opaths = []
+    for record in records:
+        if hasattr(record, "suffix"):
+            new_opath = renderer.output_path(
+                record.name,
+                in_folder=record.in_folder,
+                category=record.category,
+                suffix=record.suffix,
+            )
+        else:
+            include_folder = getattr(record, "include_folder", record.is_sequence)
+            new_opath = renderer.input_path(
+                bpath_to_opath(record.path),
+                category=record.category,
+                folder=getattr(record, "folder", ""),
+                include_folder=include_folder and not record.is_packed,
+                include_pathname=getattr(record, "include_pathname", False),
+            )
+        new_opaths.append(new_opath)
 
-        if library.filepath == "<startup.blend>" or library.filepath.endswith(
-            "startup.blend"
-        ):
-            continue
+    return new_opaths
 
-        parm = f"bpy.data.libraries['{library.name}'].filepath"
-        input_path_dict[parm] = {
-            "label": library.name,
-            "path": library.filepath,
-            "users": library.users,
-            "category": "Libraries",
-            "is_sequence": False,
-            "is_packed": bool(library.packed_file),
-        }
 
-    for scene in bpy.data.scenes:
-        if not scene.sequence_editor:
-            continue
-        for strip in scene.sequence_editor.strips_all:
-            parm = None
-            category = None
-            path = None
-
-            if strip.type == "IMAGE":
-                category = "Images"
-                path = strip.directory
-                parm = f"bpy.data.scenes['{scene.name}'].sequence_editor.strips_all['{strip.name}'].directory"
-            elif strip.type == "MOVIE":
-                category = "Videos"
-                path = strip.filepath
-                parm = f"bpy.data.scenes['{scene.name}'].sequence_editor.strips_all['{strip.name}'].filepath"
-
-            if not parm:
-                continue
+def compute_input_path_preview(input_path: OMOOSPACE_InputPath):
+    include_folder = input_path.include_folder and not input_path.is_packed
+    new_opath: "Opath" = correct_input_path(
+        bpath_to_opath(input_path.path),
+        category=input_path.category,
+        folder=input_path.folder,
+        include_folder=include_folder,
+        include_pathname=input_path.include_pathname,
+    )
 
-            input_path_dict[parm] = {
-                "label": strip.name,
-                "path": path,
-                "users": 0,
-                "category": category,
-                "is_sequence": False,
-                "is_packed": False,
-            }
-
-    return input_path_dict
-
-
-def collect_output_paths():
-    output_paths = {}
-    for scene in bpy.data.scenes:
-        parm = f"bpy.data.scenes['{scene.name}'].render.filepath"
-        not_video = scene.render.image_settings.file_format not in [
-            "AVI_JPEG",
-            "AVI_RAW",
-            "FFMPEG",
-        ]
+    input_path.preview = opath_to_bpath(new_opath)
+    input_path.preview_exists = path_exists(new_opath)
 
-        output_paths[parm] = {
-            "label": f"{scene.name}",
-            "path": scene.render.filepath,
-            "category": "Renders",
-            "name": normalize_name(scene.name),
-            "suffix": "####" if not_video else "",
-            "in_folder": not_video,
-        }
 
-    for obj in bpy.data.objects:
-        for modifier in obj.modifiers:
-            if get_type(modifier) == "NodesModifier" and hasattr(
-                modifier, "bake_directory"
-            ):
-                parm = f"bpy.data.objects['{obj.name}'].modifiers['{modifier.name}'].bake_directory"
-                output_paths[parm] = {
-                    "label": f"{obj.name} {modifier.name}",
-                    "path": modifier.bake_directory,
-                    "category": "GeometryNodes",
-                    "name": normalize_name(modifier.name),
-                    "suffix": "",
-                    "in_folder": False,
-                }
+def compute_output_path_preview(output_path: OMOOSPACE_OutputPath):
+    new_opath: "Opath" = correct_output_path(
+        output_path.name,
+        in_folder=output_path.in_folder,
+        category=output_path.category,
+        suffix=output_path.suffix,
+    )
 
-    return output_paths
+    output_path.preview = opath_to_bpath(new_opath)
 
 
 class OMOOSPACE_UL_InputPathList(bpy.types.UIList):
-    invaild_only: bpy.props.BoolProperty(
-        name="Show Invaild Path Only", options=set(), default=True
-    )  # type: ignore
-
     def draw_item(
         self, context, layout, data, item, icon, active_data, active_propname
     ):
         input_path: OMOOSPACE_InputPath = item
 
         if input_path.selected:
-            old_opath = bpath_to_opath(input_path.path)
-            is_packed = input_path.is_packed
-            include_folder = input_path.include_folder and not is_packed
-            new_opath: Opath = correct_input_path(
-                old_opath,
-                category=input_path.category,
-                folder=input_path.folder,
-                include_folder=include_folder,
-                include_pathname=input_path.include_pathname,
-            )
-
-            path_str = f"{'⁉️ 'if new_opath.exists() else ''}{opath_to_bpath(new_opath)}"
+            path_str = f"{'⁉️ 'if input_path.preview_exists else ''}{input_path.preview}"
         else:
             path_str = input_path.path
 
         label = f"{input_path.users} {input_path.label}"
+        if input_path.subspace_users:
+            label += f" ({input_path.subspace_users} subspaces)"
 
         if self.layout_type in {"DEFAULT", "COMPACT"}:
             row = layout.split(factor=0.02)
@@ -312,24 +209,162 @@ class OMOOSPACE_UL_InputPathList(bpy.types.UIList):
         elif self.layout_type == "GRID":
             ...
 
-    def draw_filter(self, context, layout):
-        layout.prop(self, "invaild_only")
-
     def filter_items(self, context, data, propname):
         input_paths = getattr(data, propname)
 
-        # Default return values.
+        # filtered by the operator already, see filter_input_path_rows
         flt_flags = [self.bitflag_filter_item] * len(input_paths)
-
-        for index, input_path in enumerate(input_paths):
-            if self.invaild_only and is_content(input_path.path):
-                flt_flags[index] &= ~self.bitflag_filter_item
-
         flt_neworder = bpy.types.UI_UL_list.sort_items_by_name(input_paths, "parm")
 
         return flt_flags, flt_neworder
 
 
+def count_subspace_users(records: list[InputPathRecord]) -> list[int]:
+    """Subspace files using each path, from the usage index.
+
+    The index is never updated here, only by Report Unused Contents.
+    """
+    omoospace = get_omoospace()
+    if not omoospace or not (omoospace.contents_dir / USAGE_INDEX).exists():
+        return [0] * len(records)
+
+    contents_key = os.path.normcase(str(omoospace.contents_dir.resolve()))
+    keys = []
+    for record in records:
+        # sequences and UDIMs are indexed by their folder
+        path, _ = get_input_usage(record, bpy.data.filepath)
+        keys.append(get_content_key(path, contents_key))
+
+    try:
+        with UsageIndex(omoospace) as index:
+            counts = index.count_users([key for key in keys if key])
+    except (sqlite3.Error, OSError):
+        return [0] * len(records)
+
+    return [counts.get(key, 0) if key else 0 for key in keys]
+
+
+PAGE_SIZE = 200
+
+INPUT_PATH_EDITS = (
+    "selected",
+    "category",
+    "folder",
+    "include_pathname",
+    "include_folder",
+)
+
+
+class InputPathRow(NamedTuple):
+    parm: str
+    label: str
+    path: str
+    users: int
+    category: str
+    is_sequence: bool
+    is_packed: bool
+    is_content: bool
+    subspace_users: int
+
+
+# rows of the open Manage Input Paths dialog, only one page becomes RNA
+input_path_rows: list[InputPathRow] = []
+# parm -> edited values of rows, kept while paging
+input_path_edits: dict[str, dict] = {}
+# rows matching current filters
+input_path_filtered: list[InputPathRow] = []
+
+
+def clear_input_path_rows():
+    input_path_rows.clear()
+    input_path_edits.clear()
+    input_path_filtered.clear()
+
+
+def get_input_path_edit(row: InputPathRow) -> dict:
+    edit = input_path_edits.get(row.parm)
+    if edit is None:
+        edit = {
+            "selected": False,
+            "category": row.category,
+            "folder": "",
+            "include_pathname": False,
+            "include_folder": row.is_sequence,
+        }
+    return edit
+
+
+def store_input_path_edits(input_paths: list[OMOOSPACE_InputPath]):
+    for input_path in input_paths:
+        input_path_edits[input_path.parm] = {
+            name: getattr(input_path, name) for name in INPUT_PATH_EDITS
+        }
+
+
+def filter_input_path_rows(
+    category: str = "ALL", invalid_only: bool = False, text: str = ""
+) -> list[InputPathRow]:
+    text = text.lower()
+    rows = []
+    for row in input_path_rows:
+        if invalid_only and row.is_content:
+            continue
+        if category != "ALL" and row.category != category:
+            continue
+        if text and text not in row.label.lower() and text not in row.path.lower():
+            continue
+        rows.append(row)
+    return rows
+
+
+def add_input_path(input_paths, row: InputPathRow):
+    edit = get_input_path_edit(row)
+
+    input_path: OMOOSPACE_InputPath = input_paths.add()
+    input_path.is_content = row.is_content
+    input_path.subspace_users = row.subspace_users
+
+    input_path.parm = row.parm
+    input_path.users = row.users
+    input_path.label = row.label
+    input_path.path = row.path
+    input_path.is_packed = row.is_packed
+    input_path.icon = CATEGORY_ICON[row.category]
+    input_path.selected = edit["selected"]
+    input_path.folder = edit["folder"]
+    input_path.include_pathname = edit["include_pathname"]
+
+    # set last, these update the preview
+    input_path.category = edit["category"]
+    input_path.include_folder = edit["include_folder"]
+
+
+def update_input_path_page(self, context):
+    """Materialize the rows of current page, edits of the last one are kept."""
+    store_input_path_edits(self.input_paths)
+    input_path_filtered[:] = filter_input_path_rows(
+        self.filter_category, self.invalid_only, self.filter_text
+    )
+
+    pages = max(1, math.ceil(len(input_path_filtered) / PAGE_SIZE))
+    if self.page > pages:
+        # calls this again
+        self.page = pages
+        return
+
+    self.input_paths.clear()
+    start = (self.page - 1) * PAGE_SIZE
+    for row in input_path_filtered[start : start + PAGE_SIZE]:
+        add_input_path(self.input_paths, row)
+
+
+def update_input_path_filter(self, context):
+    if self.page != 1:
+        self.page = 1
+    else:
+        update_input_path_page(self, context)
+
+
 def update_input_paths(self, context):
     input_paths_active = self.input_paths_active
     if input_paths_active != -1:
@@ -350,75 +385,202 @@ class ManageInputPaths(bpy.types.Operator):
         name="Input Paths", options=set(), default=-1, update=update_input_paths
     )  # type: ignore
 
-    def invoke(self, context, event):
-        for parm, item in collect_input_paths().items():
-            input_path: OMOOSPACE_InputPath = self.input_paths.add()
+    incremental: bpy.props.BoolProperty(
+        name="Incremental",
+        description="Only copy files that changed, compared by size, mtime and content hash",
+        default=True,
+    )  # type: ignore
 
-            input_path.parm = parm
-            input_path.users = item["users"]
-            input_path.label = item["label"]
-            input_path.path = item["path"]
-            input_path.category = item["category"]
-            input_path.icon = CATEGORY_ICON[item["category"]]
+    strategy: bpy.props.EnumProperty(
+        name="Transfer",
+        description="How files are put into the contents dir, unsupported strategies fall back to a copy",
+        items=TRANSFER_STRATEGIES,
+    )  # type: ignore
 
-            if item["is_sequence"]:
-                input_path.include_folder = True
+    page: bpy.props.IntProperty(
+        name="Page",
+        options={"SKIP_SAVE"},
+        default=1,
+        min=1,
+        update=update_input_path_page,
+    )  # type: ignore
+
+    filter_category: bpy.props.EnumProperty(
+        name="Category",
+        items=[("ALL", "All", "")] + [(name, name, "") for name in CATEGORY_ICON],
+        options={"SKIP_SAVE"},
+        update=update_input_path_filter,
+    )  # type: ignore
+
+    filter_text: bpy.props.StringProperty(
+        name="Search", options={"SKIP_SAVE"}, update=update_input_path_filter
+    )  # type: ignore
+
+    invalid_only: bpy.props.BoolProperty(
+        name="Show Invaild Path Only",
+        options={"SKIP_SAVE"},
+        default=True,
+        update=update_input_path_filter,
+    )  # type: ignore
 
-            input_path.is_packed = item["is_packed"]
+    def invoke(self, context, event):
+        preferences = context.preferences.addons[__package__].preferences
+        self.strategy = preferences.transfer_strategy
+
+        # previews rely on the listing, kept fresh while the dialog is open
+        hold_contents()
+        # scripts may have removed data without a depsgraph update
+        invalidate_path_index()
+        input_path_dict = collect_input_paths()
+        content_flags = classify_contents(
+            [item.path for item in input_path_dict.values()]
+        )
+        subspace_users = count_subspace_users(list(input_path_dict.values()))
+
+        # plain tuples, PropertyGroup entries are only made for one page
+        clear_input_path_rows()
+        for (parm, item), is_content, users in zip(
+            input_path_dict.items(), content_flags, subspace_users
+        ):
+            input_path_rows.append(
+                InputPathRow(
+                    parm=parm,
+                    label=item.label,
+                    path=item.path,
+                    users=item.users,
+                    category=item.category,
+                    is_sequence=item.is_sequence,
+                    is_packed=item.is_packed,
+                    is_content=is_content,
+                    subspace_users=users,
+                )
+            )
+        input_path_rows.sort(key=lambda row: row.parm)
+        update_input_path_page(self, context)
 
         context.window_manager.invoke_props_dialog(self, width=800)
         return {"RUNNING_MODAL"}
 
+    def cancel(self, context):
+        release_contents()
+        clear_input_path_rows()
+
     def execute(self, context):
-        input_paths: list[OMOOSPACE_InputPath] = self.input_paths
+        release_contents()
+        # rows selected on any page, not only the shown one
+        store_input_path_edits(self.input_paths)
+        input_paths = [
+            SimpleNamespace(**{**row._asdict(), **input_path_edits[row.parm]})
+            for row in input_path_rows
+            if input_path_edits.get(row.parm, {}).get("selected")
+        ]
+        clear_input_path_rows()
+
+        with stage("collect"):
+            invalidate_path_index()
+            records = collect_input_paths()
+
+        with stage("render"):
+            new_opaths = render_paths(input_paths)
 
-        for input_path in input_paths:
+        jobs = []
+        transfers = []
+        failed = 0
+        for input_path, new_opath in zip(input_paths, new_opaths):
             # skip
             if not input_path.selected:
                 continue
 
             parm: str = input_path.parm
+            record: InputPathRecord = records.get(parm)
+            if record is None:
+                self.report({"WARNING"}, f"Path not found, skip '{parm}'.")
+                continue
+
             old_bpath = input_path.path
             is_packed = input_path.is_packed
             include_folder = input_path.include_folder and not is_packed
 
             old_opath = bpath_to_opath(old_bpath)
-            new_opath = correct_input_path(
-                old_opath,
-                category=input_path.category,
-                folder=input_path.folder,
-                include_folder=include_folder,
-                include_pathname=input_path.include_pathname,
-            )
             new_bpath: str = opath_to_bpath(new_opath)
 
-            # TODO: 需要更好的方案去解决打包的文件，目前只实现了图片类的问题，而且处理的不好
-            try:
-                if is_packed:
-                    exec(f"{parm.removesuffix('.filepath')}.unpack()")
-                    old_opath = bpath_to_opath(f"//textures/{old_opath.name}")
-
-                if include_folder:
-                    copy_to(old_opath.parent, new_opath.parent.parent)
-                else:
-                    copy_to(old_opath, new_opath.parent)
-
-                exec(f"{parm}=r'{new_bpath}'")
+            # packed data is written straight to the new path, stays packed
+            if is_packed:
+                try:
+                    with stage("write_packed"):
+                        write_packed_files(record.handle.owner, new_opath)
+                    record.set(new_bpath)
+                    self.report({"INFO"}, f"{old_bpath} -> {new_bpath}")
+                except Exception as err:
+                    failed += 1
+                    self.report({"WARNING"}, f"Fail to write, skip '{parm}': {err}")
+                continue
 
-                # repack to confirm filepath
-                if is_packed:
-                    old_opath.remove()
-                    exec(f"{parm.removesuffix('.filepath')}.pack()")
+            if include_folder and input_path.is_sequence:
+                # only the frames of this sequence, not the whole folder
+                transfers.append((get_sequence_source(old_opath), new_opath.parent))
+            elif include_folder:
+                transfers.append((old_opath.parent, new_opath.parent.parent))
+            else:
+                transfers.append((old_opath, new_opath.parent))
+
+            jobs.append(
+                {
+                    "parm": parm,
+                    "record": record,
+                    "old_bpath": old_bpath,
+                    "new_bpath": new_bpath,
+                }
+            )
 
-                self.report({"INFO"}, f"{old_bpath} -> {new_bpath}")
-            except Exception as err:
-                print(err)
-                self.report({"WARNING"}, f"Fail to copy, skip '{parm}'.")
+        contents_dir = get_omoospace().contents_dir
+        hash_index = load_hash_index(contents_dir) if self.incremental else None
+        # same file or sequence folder used by several datablocks, copied once
+        with stage("plan"):
+            saved_size = get_duplicate_size(transfers)
+
+        # files are copied in worker threads, bpy data is only changed here
+        wm = context.window_manager
+        wm.progress_begin(0, len(jobs))
+        copies = copy_all(
+            transfers,
+            incremental=self.incremental,
+            hash_index=hash_index,
+            strategy=self.strategy,
+        )
+        with stage("copy"):
+            for done, (index, err) in enumerate(copies, 1):
+                wm.progress_update(done)
+                job = jobs[index]
+                parm = job["parm"]
+
+                try:
+                    if err:
+                        raise err
+
+                    record: InputPathRecord = job["record"]
+                    record.set(job["new_bpath"])
+
+                    self.report(
+                        {"INFO"}, f"{job['old_bpath']} -> {job['new_bpath']}"
+                    )
+                except Exception as err:
+                    failed += 1
+                    self.report(
+                        {"WARNING"}, f"Fail to copy, skip '{parm}': {err}"
+                    )
+        wm.progress_end()
+
+        if hash_index:
+            save_hash_index(contents_dir, hash_index)
+
+        if saved_size:
+            self.report(
+                {"INFO"}, f"Shared sources copied once, {format_size(saved_size)} saved."
+            )
 
-        local_unpack_dir = bpath_to_opath(f"//textures")
-        if local_unpack_dir.exists():
-            if len(local_unpack_dir.get_children(recursive=False)) == 0:
-                local_unpack_dir.remove()
+        if failed:
+            self.report({"WARNING"}, f"{failed} input paths failed.")
 
         return {"FINISHED"}
 
@@ -435,7 +597,15 @@ class ManageInputPaths(bpy.types.Operator):
         row = row.split(factor=0.15)
         row.label(text="Preview")
         row = row.split(factor=1)
-        row.label(text="⁉️= file already exists, only change path")
+        row.label(text="⁉️= file already exists, kept unless copied from the same source")
+
+        row = layout.row()
+        row.prop(self, "filter_category", text="")
+        row.prop(self, "filter_text", text="", icon="VIEWZOOM")
+        row.prop(self, "invalid_only")
+        pages = max(1, math.ceil(len(input_path_filtered) / PAGE_SIZE))
+        row.prop(self, "page", text=f"Page (of {pages})")
+        row.label(text=f"{len(input_path_filtered)} paths")
 
         layout.template_list(
             listtype_name="OMOOSPACE_UL_InputPathList",
@@ -447,6 +617,9 @@ class ManageInputPaths(bpy.types.Operator):
             item_dyntip_propname="path",
             rows=20,
         )
+        row = layout.row()
+        row.prop(self, "incremental")
+        row.prop(self, "strategy")
 
 
 class OMOOSPACE_UL_OutputPathList(bpy.types.UIList):
@@ -461,14 +634,7 @@ class OMOOSPACE_UL_OutputPathList(bpy.types.UIList):
         output_path: OMOOSPACE_OutputPath = item
 
         if output_path.selected:
-            new_opath: Path = correct_output_path(
-                output_path.name,
-                in_folder=output_path.in_folder,
-                category=output_path.category,
-                suffix=output_path.suffix,
-            )
-
-            path_str = opath_to_bpath(new_opath)
+            path_str = output_path.preview
         else:
             path_str = output_path.path
 
@@ -505,9 +671,10 @@ class OMOOSPACE_UL_OutputPathList(bpy.types.UIList):
         # Default return values.
         flt_flags = [self.bitflag_filter_item] * len(output_paths)
 
-        for index, output_path in enumerate(output_paths):
-            if self.invaild_only and is_content(output_path.path):
-                flt_flags[index] &= ~self.bitflag_filter_item
+        if self.invaild_only:
+            for index, output_path in enumerate(output_paths):
+                if output_path.is_content:
+                    flt_flags[index] &= ~self.bitflag_filter_item
 
         flt_neworder = bpy.types.UI_UL_list.sort_items_by_name(output_paths, "parm")
 
@@ -535,42 +702,52 @@ class ManageOutputPaths(bpy.types.Operator):
     )  # type: ignore
 
     def invoke(self, context, event):
-        for parm, item in collect_output_paths().items():
+        invalidate_path_index()
+        output_path_dict = collect_output_paths()
+        content_flags = classify_contents(
+            [item.path for item in output_path_dict.values()]
+        )
+
+        for (parm, item), is_content in zip(output_path_dict.items(), content_flags):
             output_path: OMOOSPACE_OutputPath = self.output_paths.add()
-            output_path.label = item["label"]
+            output_path.is_content = is_content
+            output_path.label = item.label
             output_path.parm = parm
-            output_path.path = item["path"]
-            output_path.category = item["category"]
-            output_path.icon = CATEGORY_ICON[item["category"]]
-            output_path.name = item["name"]
-            output_path.suffix = item["suffix"]
-            output_path.in_folder = item["in_folder"]
+            output_path.path = item.path
+            output_path.category = item.category
+            output_path.icon = CATEGORY_ICON[item.category]
+            output_path.name = item.name
+            output_path.suffix = item.suffix
+            output_path.in_folder = item.in_folder
 
         context.window_manager.invoke_props_dialog(self, width=900)
         return {"RUNNING_MODAL"}
 
     def execute(self, context):
         output_paths: list[OMOOSPACE_OutputPath] = self.output_paths
+        invalidate_path_index()
+        records = collect_output_paths()
 
-        for output_path in output_paths:
-            # skip
-            if not output_path.selected:
-                continue
+        selected = [output_path for output_path in output_paths if output_path.selected]
+        new_opaths = render_paths(selected)
 
+        changed_records = []
+        new_bpaths = []
+        for output_path, new_opath in zip(selected, new_opaths):
             parm = output_path.parm
-            old_bpath = output_path.path
-            new_opath = correct_output_path(
-                output_path.name,
-                in_folder=output_path.in_folder,
-                category=output_path.category,
-                suffix=output_path.suffix,
-            )
+            if parm not in records:
+                self.report({"WARNING"}, f"Path not found, skip '{parm}'.")
+                continue
 
+            old_bpath = output_path.path
             new_bpath: str = opath_to_bpath(new_opath)
 
-            exec(f"{parm}=r'{new_bpath}'")
+            changed_records.append(records[parm])
+            new_bpaths.append(new_bpath)
             self.report({"INFO"}, f"{old_bpath} -> {new_bpath}")
 
+        apply_paths(changed_records, new_bpaths)
+
         return {"FINISHED"}
 
     def draw(self, context):
@@ -600,13 +777,89 @@ class ManageOutputPaths(bpy.types.Operator):
         )
 
 
+def find_missing_input_paths() -> list[InputPathRecord]:
+    """Input paths whose files are gone, packed ones are never missing."""
+    missing = []
+    for record in collect_input_paths().values():
+        if record.is_packed:
+            continue
+
+        opath = bpath_to_opath(record.path)
+        # tiles are not listed one by one, their folder must exist at least
+        if UDIM_TOKEN in opath.name:
+            opath = opath.parent
+
+        if not path_exists(opath):
+            missing.append(record)
+
+    return missing
+
+
+class ReportMissingFiles(bpy.types.Operator):
+    bl_idname = "omoospace.report_missing_files"
+    bl_label = "Report Missing Files"
+    bl_description = "List all input paths whose files do not exist"
+
+    def execute(self, context):
+        poll_contents()
+        invalidate_path_index()
+        missing = find_missing_input_paths()
+
+        for record in missing:
+            self.report({"WARNING"}, f"Missing '{record.label}': {record.path}")
+
+        if missing:
+            self.report({"WARNING"}, f"{len(missing)} input files are missing.")
+        else:
+            self.report({"INFO"}, "No missing files.")
+
+        return {"FINISHED"}
+
+
+class ReportUnusedContents(bpy.types.Operator):
+    bl_idname = "omoospace.report_unused_contents"
+    bl_label = "Report Unused Contents"
+    bl_description = "Update the usage index of all subspace files, then list contents none of them uses"
+
+    def execute(self, context):
+        omoospace = get_omoospace()
+        if not omoospace:
+            self.report({"ERROR"}, "Not in an omoospace.")
+            return {"CANCELLED"}
+
+        try:
+            with UsageIndex(omoospace) as index:
+                result = index.update()
+                orphans = index.find_orphans()
+        except (sqlite3.Error, OSError) as err:
+            self.report({"ERROR"}, f"Fail to update usage index: {err}")
+            return {"CANCELLED"}
+
+        for blend, err in result["failed"]:
+            self.report({"WARNING"}, f"Fail to read '{blend}': {err}")
+
+        for orphan in orphans:
+            self.report({"WARNING"}, f"Unused: {orphan}")
+
+        self.report(
+            {"INFO"},
+            f"{len(orphans)} unused contents, "
+            f"{result['updated']} subspace files indexed again.",
+        )
+        return {"FINISHED"}
+
+
+@profiled
 def correct_path_on_save_pre(blend_file: str):
     # if new file is not in omoospace, no need to correct
-    try:
-        old_contents_dir = get_omoospace().contents_dir
-        new_contents_dir = Omoospace(blend_file).contents_dir
-    except AttributeError:
-        return
+    from omoospace import Opath, Omoospace
+
+    with stage("omoospace"):
+        try:
+            old_contents_dir = get_omoospace().contents_dir
+            new_contents_dir = Omoospace(blend_file).contents_dir
+        except AttributeError:
+            return
 
     new_rel_contents_dir = opath_to_bpath(new_contents_dir, blend_file)
     set_subspace_data("rel_contents_dir", new_rel_contents_dir)
@@ -618,41 +871,52 @@ def correct_path_on_save_pre(blend_file: str):
     wm = bpy.context.window_manager
     wm.old_path_list.clear()
 
-    output_paths = [
-        {"parm": parm, "path": item["path"]}
-        for parm, item in collect_output_paths().items()
-        if is_content(item["path"])
-    ]
+    with stage("collect"):
+        output_paths: list[OutputPathRecord] = [
+            item for item in collect_output_paths().values() if is_content(item.path)
+        ]
 
+    new_bpaths = []
     for output_path in output_paths:
-        parm = output_path["parm"]
-        old_bpath = output_path["path"]
+        parm = output_path.parm
+        old_bpath = output_path.path
 
         old_opath = bpath_to_opath(old_bpath)
         old_rel_bpath = str(old_opath.relative_to(old_contents_dir))
-        new_bpath: str = f"{new_rel_contents_dir}/{old_rel_bpath}"
-
-        exec(f"{parm}=r'{new_bpath}'")
+        new_bpaths.append(f"{new_rel_contents_dir}/{old_rel_bpath}")
 
         old_path: OMOOSPACE_OldPath = wm.old_path_list.add()
         old_path.parm = parm
         old_path.path = old_bpath
 
+    with stage("set_paths"):
+        apply_paths(output_paths, new_bpaths)
+
     # if in same omoospace, no need to correct input paths
     # blender will handle all relative input paths
     if old_contents_dir == new_contents_dir:
         return
 
-    input_paths = [
-        {"parm": parm, "is_packed": item["is_packed"], "path": item["path"]}
-        for parm, item in collect_input_paths().items()
-        if is_content(item["path"])
-    ]
+    with stage("collect"):
+        input_paths: list[InputPathRecord] = [
+            item for item in collect_input_paths().values() if is_content(item.path)
+        ]
+
+    preferences = bpy.context.preferences.addons[__package__].preferences
+    background_transfers = preferences.background_transfers
+    # the source omoospace must keep working, never move or hardlink its contents
+    strategy = preferences.transfer_strategy
+    if strategy not in KEEP_SOURCE_STRATEGIES:
+        strategy = "COPY"
 
+    # (src, dir) already copied or queued, shared by several datablocks,
+    # with the paths to set back if a background transfer fails
+    transferred = {}
     for input_path in input_paths:
-        parm = input_path["parm"]
-        old_bpath = input_path["path"]
-        is_packed = input_path["is_packed"]
+        parm = input_path.parm
+        handle: PathHandle = input_path.handle
+        old_bpath = input_path.path
+        is_packed = input_path.is_packed
 
         old_opath = bpath_to_opath(old_bpath)
         old_rel_bpath = str(old_opath.relative_to(old_contents_dir))
@@ -664,33 +928,71 @@ def correct_path_on_save_pre(blend_file: str):
 
         # if copy fail, skip change path
         try:
+            paths = None
             if is_packed:
-                exec(f"{parm.removesuffix('.filepath')}.unpack()")
-                old_opath = bpath_to_opath(f"//textures/{old_opath.name}")
-
-            copy_to(old_opath, new_opath.parent)
-
-            exec(f"{parm}=r'{new_bpath}'")
+                # packed data is written straight to the new path, stays packed
+                with stage("write_packed"):
+                    write_packed_files(handle.owner, new_opath)
+            else:
+                # every frame of a sequence, not only the referenced one
+                src = (
+                    get_sequence_source(old_opath)
+                    if input_path.is_sequence
+                    else old_opath
+                )
+                key = get_transfer_key(src, new_opath.parent)
+                paths = transferred.get(key)
+                if paths is None:
+                    paths = []
+                    with stage("copy"):
+                        if background_transfers:
+                            queue_transfer(
+                                src,
+                                new_opath.parent,
+                                label=parm,
+                                strategy=strategy,
+                                paths=paths,
+                            )
+                        else:
+                            copy_to(src, new_opath.parent, strategy=strategy)
+                    transferred[key] = paths
+
+            with stage("set_paths"):
+                input_path.set(new_bpath)
+                if paths is not None:
+                    paths.append((handle, old_bpath, handle.get()))
             print(f"{old_bpath} -> {new_bpath}")
 
             old_path: OMOOSPACE_OldPath = wm.old_path_list.add()
             old_path.parm = parm
             old_path.path = old_bpath
 
-            # repack to confirm filepath
-            if is_packed:
-                old_opath.remove()
-                exec(f"{parm.removesuffix('.filepath')}.pack()")
-
         except Exception as err:
             print(err)
 
-    local_unpack_dir = bpath_to_opath(f"//textures")
-    if local_unpack_dir.exists():
-        if len(local_unpack_dir.get_children(recursive=False)) == 0:
-            local_unpack_dir.remove()
 
+@profiled
+def store_path_fingerprint_on_save_pre(blend_file: str):
+    """Let the next load skip correct_path_on_load_post, see get_path_fingerprint."""
+    from omoospace import Opath
+
+    rel_contents_dir = get_subspace_data("rel_contents_dir")
+    if rel_contents_dir is None or not get_omoospace():
+        return
+
+    fingerprint = get_path_fingerprint(rel_contents_dir)
+    if Opath(bpy.data.filepath) == Opath(blend_file):
+        # only absolute paths can be contents that are not relative yet
+        absolute = [path for path in iter_paths() if not path.startswith("//")]
+        fingerprint["clean"] = not any(classify_contents(absolute))
+    else:
+        # saved somewhere else, contents are judged from there on next load
+        fingerprint["clean"] = False
+
+    set_subspace_data("fingerprint", fingerprint)
 
+
+@profiled
 def restore_path_on_save_post(blend_file: str):
     wm = bpy.context.window_manager
 
@@ -698,40 +1000,70 @@ def restore_path_on_save_post(blend_file: str):
     if bpy.data.filepath == blend_file:
         return
 
-    for path_item in wm.old_path_list:
-        parm = path_item.parm
-        old_bpath = path_item.path
-        exec(f"{parm}=r'{old_bpath}'")
+    if len(wm.old_path_list) == 0:
+        return
+
+    all_paths = {**collect_input_paths(), **collect_output_paths()}
+    path_items = [item for item in wm.old_path_list if item.parm in all_paths]
+
+    apply_paths(
+        [all_paths[item.parm] for item in path_items],
+        [item.path for item in path_items],
+    )
 
 
+@profiled
 def correct_path_on_load_post():
     # if not in omoospace, no need to correct
-    try:
-        contents_dir = get_omoospace().contents_dir
-        old_rel_contents_dir = get_subspace_data("rel_contents_dir")
-        new_rel_contents_dir = opath_to_bpath(contents_dir)
-    except AttributeError:
-        return
+    with stage("omoospace"):
+        try:
+            contents_dir = get_omoospace().contents_dir
+            old_rel_contents_dir = get_subspace_data("rel_contents_dir")
+            new_rel_contents_dir = opath_to_bpath(contents_dir)
+        except AttributeError:
+            return
+
+    # nothing moved since last save, and no absolute content path was saved
+    fingerprint = get_subspace_data("fingerprint")
+    if (
+        fingerprint
+        and fingerprint.get("clean")
+        and fingerprint.get("rel_contents_dir") == new_rel_contents_dir
+    ):
+        with stage("fingerprint"):
+            current = get_path_fingerprint(new_rel_contents_dir)
+        if (current["count"], current["hash"]) == (
+            fingerprint.get("count"),
+            fingerprint.get("hash"),
+        ):
+            return
 
-    all_paths = {**collect_input_paths(), **collect_output_paths()}
+    with stage("collect"):
+        all_paths = {**collect_input_paths(), **collect_output_paths()}
 
-    for parm, item in all_paths.items():
-        old_bpath = item["path"]
+    with stage("correct"):
+        for parm, item in all_paths.items():
+            old_bpath = item.path
 
-        # 如果是内容，则绝对路径改为相对路径
-        if is_content(old_bpath) and not old_bpath.startswith("//"):
+            # 如果是内容，则绝对路径改为相对路径
+            if is_content(old_bpath) and not old_bpath.startswith("//"):
 
-            new_bpath = bpy.path.relpath(old_bpath)
-            exec(f"{parm}=r'{new_bpath}'")
-            print(f"{old_bpath} -> {new_bpath}")
-            old_bpath = new_bpath
+                new_bpath = bpy.path.relpath(old_bpath)
+                item.set(new_bpath)
+                print(f"{old_bpath} -> {new_bpath}")
+                old_bpath = new_bpath
 
-        if old_rel_contents_dir == new_rel_contents_dir or old_rel_contents_dir is None:
-            continue
+            if (
+                old_rel_contents_dir == new_rel_contents_dir
+                or old_rel_contents_dir is None
+            ):
+                continue
 
-        # 如果符合记录中的相对位置，改为新的相对位置
-        if old_bpath.startswith(old_rel_contents_dir):
+            # 如果符合记录中的相对位置，改为新的相对位置
+            if old_bpath.startswith(old_rel_contents_dir):
 
-            new_bpath = old_bpath.replace(old_rel_contents_dir, new_rel_contents_dir)
-            exec(f"{parm}=r'{new_bpath}'")
-            print(f"{old_bpath} -> {new_bpath}")
+                new_bpath = old_bpath.replace(
+                    old_rel_contents_dir, new_rel_contents_dir
+                )
+                item.set(new_bpath)
+                print(f"{old_bpath} -> {new_bpath}")
@@ -1,7 +1,13 @@
 import bpy
 from .utils import get_omoospace, get_pathname
-from .manage_paths import ManageInputPaths, ManageOutputPaths
+from .manage_paths import (
+    ManageInputPaths,
+    ManageOutputPaths,
+    ReportMissingFiles,
+    ReportUnusedContents,
+)
 from .operators import CreateOmoospace, RevealPath, CopyToClipboard
+from .transfers import get_transfer_status_text, has_pending_transfers
 
 
 class OmoospaceMenu(bpy.types.Menu):
@@ -33,6 +39,12 @@ class OmoospaceMenu(bpy.types.Menu):
             layout.separator()
             layout.operator(ManageInputPaths.bl_idname)
             layout.operator(ManageOutputPaths.bl_idname)
+            layout.operator(ReportMissingFiles.bl_idname)
+            layout.operator(ReportUnusedContents.bl_idname)
+            layout.separator()
+
+        if has_pending_transfers():
+            layout.label(text=get_transfer_status_text(), icon="SORTTIME")
             layout.separator()
 
         layout.operator(CreateOmoospace.bl_idname)
@@ -2,7 +2,6 @@ import bpy
 from pathlib import Path
 
 from .utils import bpath_to_opath
-from omoospace import create_omoospace, normalize_name, copy_to_clipboard, Opath
 
 
 class CreateOmoospace(bpy.types.Operator):
@@ -33,6 +32,8 @@ class CreateOmoospace(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
     def execute(self, context):
+        from omoospace import create_omoospace, normalize_name
+
         file_name = bpy.path.basename(bpy.data.filepath) or "Untitled"
         file_name = normalize_name(file_name)
 
@@ -67,6 +68,8 @@ class CreateOmoospace(bpy.types.Operator):
         return {"FINISHED"}
 
     def draw(self, context):
+        from omoospace import normalize_name, Opath
+
         file_name = bpy.path.basename(bpy.data.filepath) or "Untitled"
         file_name = normalize_name(file_name)
 
@@ -115,6 +118,8 @@ class CopyToClipboard(bpy.types.Operator):
     text: bpy.props.StringProperty(name="Text to Copy", default="")  # type: ignore
 
     def execute(self, context):
+        from omoospace import copy_to_clipboard
+
         copy_to_clipboard(self.text)
         self.report({"INFO"}, f"Successfully copyed '{self.text}'")
         return {"FINISHED"}
@@ -0,0 +1,250 @@
+import bpy
+import hashlib
+
+from .path_records import InputPathRecord, OutputPathRecord, video_format
+from .utils import PathHandle, get_type, is_sequence
+
+_path_index = None
+
+
+class PathIndex:
+    """All input and output paths of current file, keyed by parm."""
+
+    __slots__ = ("inputs", "outputs")
+
+    def __init__(self):
+        self.inputs: dict[str, InputPathRecord] = {}
+        self.outputs: dict[str, OutputPathRecord] = {}
+
+    def add_input(self, owner, attr: str, parm: str, **kwargs):
+        self.inputs[parm] = InputPathRecord(
+            parm, PathHandle(owner, attr), path=getattr(owner, attr), **kwargs
+        )
+
+    def add_output(self, owner, attr: str, parm: str, **kwargs):
+        self.outputs[parm] = OutputPathRecord(
+            parm, PathHandle(owner, attr), path=getattr(owner, attr), **kwargs
+        )
+
+
+def build_path_index() -> PathIndex:
+    """Walk every datablock collection only once."""
+    from omoospace import normalize_name
+
+    index = PathIndex()
+
+    # TODO: 是否应该包括要那些没有在使用的资源？
+    for image in bpy.data.images:
+        filepath = image.filepath
+        if not filepath:
+            continue
+
+        index.add_input(
+            image,
+            "filepath",
+            f"bpy.data.images['{image.name}'].filepath",
+            label=image.name,
+            users=image.users,
+            category="Videos" if filepath.endswith(video_format) else "Images",
+            is_sequence=is_sequence(filepath),
+            is_packed=bool(image.packed_file),
+        )
+
+    for sound in bpy.data.sounds:
+        filepath = sound.filepath
+        if not filepath:
+            continue
+
+        index.add_input(
+            sound,
+            "filepath",
+            f"bpy.data.sounds['{sound.name}'].filepath",
+            label=sound.name,
+            users=sound.users,
+            category="Videos" if filepath.endswith(video_format) else "Audios",
+            is_sequence=False,
+            is_packed=bool(sound.packed_file),
+        )
+
+    for volume in bpy.data.volumes:
+        if not volume.filepath:
+            continue
+
+        index.add_input(
+            volume,
+            "filepath",
+            f"bpy.data.volumes['{volume.name}'].filepath",
+            label=volume.name,
+            users=volume.users,
+            category="Volumes",
+            is_sequence=volume.is_sequence,
+            is_packed=bool(volume.packed_file),
+        )
+
+    for cache_file in bpy.data.cache_files:
+        filepath = cache_file.filepath
+        if not filepath:
+            continue
+
+        index.add_input(
+            cache_file,
+            "filepath",
+            f"bpy.data.cache_files['{cache_file.name}'].filepath",
+            label=cache_file.name,
+            users=cache_file.users,
+            category="Dynamics",
+            is_sequence=is_sequence(filepath),
+            is_packed=False,
+        )
+
+    for library in bpy.data.libraries:
+        filepath = library.filepath
+        if not filepath:
+            continue
+
+        if filepath == "<startup.blend>" or filepath.endswith("startup.blend"):
+            continue
+
+        index.add_input(
+            library,
+            "filepath",
+            f"bpy.data.libraries['{library.name}'].filepath",
+            label=library.name,
+            users=library.users,
+            category="Libraries",
+            is_sequence=False,
+            is_packed=bool(library.packed_file),
+        )
+
+    # render outputs and sequencer strips in the same scene pass
+    for scene in bpy.data.scenes:
+        not_video = scene.render.image_settings.file_format not in [
+            "AVI_JPEG",
+            "AVI_RAW",
+            "FFMPEG",
+        ]
+
+        index.add_output(
+            scene.render,
+            "filepath",
+            f"bpy.data.scenes['{scene.name}'].render.filepath",
+            label=f"{scene.name}",
+            category="Renders",
+            name=normalize_name(scene.name),
+            suffix="####" if not_video else "",
+            in_folder=not_video,
+        )
+
+        if not scene.sequence_editor:
+            continue
+
+        for strip in scene.sequence_editor.strips_all:
+            if strip.type == "IMAGE":
+                category = "Images"
+                attr = "directory"
+            elif strip.type == "MOVIE":
+                category = "Videos"
+                attr = "filepath"
+            else:
+                continue
+
+            index.add_input(
+                strip,
+                attr,
+                f"bpy.data.scenes['{scene.name}'].sequence_editor.strips_all['{strip.name}'].{attr}",
+                label=strip.name,
+                users=0,
+                category=category,
+                is_sequence=False,
+                is_packed=False,
+            )
+
+    for obj in bpy.data.objects:
+        for modifier in obj.modifiers:
+            if get_type(modifier) == "NodesModifier" and hasattr(
+                modifier, "bake_directory"
+            ):
+                index.add_output(
+                    modifier,
+                    "bake_directory",
+                    f"bpy.data.objects['{obj.name}'].modifiers['{modifier.name}'].bake_directory",
+                    label=f"{obj.name} {modifier.name}",
+                    category="GeometryNodes",
+                    name=normalize_name(modifier.name),
+                    suffix="",
+                    in_folder=False,
+                )
+
+    return index
+
+
+def iter_paths():
+    """Every path build_path_index collects, as plain strings, no records."""
+    for collection in (
+        bpy.data.images,
+        bpy.data.sounds,
+        bpy.data.volumes,
+        bpy.data.cache_files,
+        bpy.data.libraries,
+    ):
+        for block in collection:
+            if block.filepath:
+                yield block.filepath
+
+    for scene in bpy.data.scenes:
+        yield scene.render.filepath
+        if not scene.sequence_editor:
+            continue
+        for strip in scene.sequence_editor.strips_all:
+            if strip.type == "IMAGE":
+                yield strip.directory
+            elif strip.type == "MOVIE":
+                yield strip.filepath
+
+    for obj in bpy.data.objects:
+        for modifier in obj.modifiers:
+            if get_type(modifier) == "NodesModifier" and hasattr(
+                modifier, "bake_directory"
+            ):
+                yield modifier.bake_directory
+
+
+def get_path_fingerprint(rel_contents_dir: str) -> dict:
+    """Contents dir, path count and a hash of all paths, no disk access."""
+    digest = hashlib.blake2b(digest_size=8)
+    count = 0
+    for path in iter_paths():
+        digest.update(path.encode("utf-8", errors="surrogateescape"))
+        digest.update(b"\0")
+        count += 1
+
+    return {
+        "rel_contents_dir": rel_contents_dir,
+        "count": count,
+        "hash": digest.hexdigest(),
+    }
+
+
+def get_path_index() -> PathIndex:
+    """Get the path index, built once per depsgraph/undo step.
+
+    Records refer to datablocks, strips and modifiers directly, the index is
+    also dropped when a file is loaded or saved, see events.
+    """
+    global _path_index
+    if _path_index is None:
+        _path_index = build_path_index()
+    return _path_index
+
+
+def invalidate_path_index():
+    global _path_index
+    _path_index = None
+
+
+def collect_input_paths() -> dict[str, InputPathRecord]:
+    return get_path_index().inputs
+
+
+def collect_output_paths() -> dict[str, OutputPathRecord]:
+    return get_path_index().outputs
@@ -0,0 +1,100 @@
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .utils import PathHandle
+
+# no bpy here, blend_reader builds these records outside of Blender
+
+video_format = (
+    ".mp4",
+    ".mov",
+    ".avi",
+    ".mkv",
+    ".wmv",
+    ".flv",
+    ".webm",
+)
+
+
+class InputPathRecord:
+    __slots__ = (
+        "parm",
+        "handle",
+        "label",
+        "path",
+        "users",
+        "category",
+        "is_sequence",
+        "is_packed",
+    )
+
+    def __init__(
+        self,
+        parm: str,
+        handle: "PathHandle",
+        label: str,
+        path: str,
+        users: int,
+        category: str,
+        is_sequence: bool,
+        is_packed: bool,
+    ):
+        self.parm = parm
+        self.handle = handle
+        self.label = label
+        self.path = path
+        self.users = users
+        self.category = category
+        self.is_sequence = is_sequence
+        self.is_packed = is_packed
+
+    def set(self, value: str):
+        """Set the path property, keeping this record up to date."""
+        self.handle.set(value)
+        self.path = value
+
+
+class OutputPathRecord:
+    __slots__ = (
+        "parm",
+        "handle",
+        "label",
+        "path",
+        "category",
+        "name",
+        "suffix",
+        "in_folder",
+    )
+
+    def __init__(
+        self,
+        parm: str,
+        handle: "PathHandle",
+        label: str,
+        path: str,
+        category: str,
+        name: str,
+        suffix: str,
+        in_folder: bool,
+    ):
+        self.parm = parm
+        self.handle = handle
+        self.label = label
+        self.path = path
+        self.category = category
+        self.name = name
+        self.suffix = suffix
+        self.in_folder = in_folder
+
+    def set(self, value: str):
+        """Set the path property, keeping this record up to date."""
+        self.handle.set(value)
+        self.path = value
+
+
+def is_sequence_name(path: str) -> bool:
+    """Like utils.is_sequence, only looks at the file name."""
+    stem = os.path.splitext(os.path.basename(path.replace("\\", "/")))[0]
+    last = stem.split(".")[-1]
+    return last.isnumeric() and len(last) >= 3
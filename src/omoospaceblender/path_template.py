@@ -0,0 +1,171 @@
+"""Layouts of new content paths, per omoospace.
+
+The layout can be declared in the omoospace profile, relative to the
+contents dir:
+
+    input_path_template: "{category}/{pathname}_{folder}/{name}"
+    output_path_template: "{category}/{folder}/{stem}{ext}"
+
+Text between two fields is a separator, it is dropped when a field beside
+it is empty, a folder whose fields are all empty is dropped. Templates are
+compiled once, rendering is plain string joins.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from omoospace import Opath
+
+
+INPUT_PATH_TEMPLATE = "{category}/{pathname}_{folder}/{name}"
+OUTPUT_PATH_TEMPLATE = "{category}/{folder}/{stem}{ext}"
+
+# name: file name, or "parent/file" for sequences
+INPUT_FIELDS = {"category", "pathname", "folder", "name"}
+# stem: [pathname_]name, folder: stem when in a folder, ext: ".suffix"
+OUTPUT_FIELDS = {"category", "pathname", "name", "stem", "folder", "ext"}
+
+
+class PathTemplate:
+    """Compiled template, see `compile_path_template`."""
+
+    def __init__(self, template: str, segments: list[tuple]):
+        self.template = template
+        # per folder: (literals, fields), literals has one more item
+        self.segments = segments
+
+    def __repr__(self):
+        return f"PathTemplate({self.template!r})"
+
+    def render(self, values: dict) -> str:
+        """Path relative to the contents dir, as posix."""
+        parts = []
+        for literals, fields in self.segments:
+            if not fields:
+                parts.append(literals[0])
+                continue
+
+            text = literals[0]
+            filled = False
+            for index, field in enumerate(fields):
+                value = values[field]
+                if not value:
+                    continue
+                if filled:
+                    text += literals[index]
+                text += value
+                filled = True
+
+            if filled:
+                parts.append(text + literals[-1])
+
+        return "/".join(parts)
+
+
+@lru_cache(maxsize=None)
+def compile_path_template(template: str, fields: frozenset) -> PathTemplate:
+    """Parse template once, raise ValueError if it is not a valid layout."""
+    segments = []
+    for segment in template.replace("\\", "/").strip("/").split("/"):
+        if segment in ("", ".", ".."):
+            raise ValueError(
+                f"Invalid folder '{segment}' in path template {template!r}."
+            )
+
+        literals = [""]
+        segment_fields = []
+        for literal, field, spec, conversion in Formatter().parse(segment):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if field not in fields:
+                raise ValueError(
+                    f"Unknown field '{{{field}}}' in path template {template!r}, "
+                    f"use {', '.join(sorted(fields))}."
+                )
+            if spec or conversion:
+                raise ValueError(
+                    f"Format spec is not supported in path template {template!r}."
+                )
+            segment_fields.append(field)
+            literals.append("")
+
+        segments.append((literals, segment_fields))
+
+    return PathTemplate(template, segments)
+
+
+class PathRenderer:
+    """New content paths of one subspace file.
+
+    Contents dir, pathname and templates are resolved once, see
+    `utils.get_path_renderer`.
+    """
+
+    def __init__(
+        self,
+        contents_dir: Opath,
+        pathname: str,
+        input_template: str = None,
+        output_template: str = None,
+    ):
+        from omoospace import Opath
+
+        self.contents_dir = Opath(contents_dir)
+        self.pathname = pathname
+        self.input_template = compile_path_template(
+            input_template or INPUT_PATH_TEMPLATE, frozenset(INPUT_FIELDS)
+        )
+        self.output_template = compile_path_template(
+            output_template or OUTPUT_PATH_TEMPLATE, frozenset(OUTPUT_FIELDS)
+        )
+
+        # files are copied into the parent of the new path, keeping their names
+        literals, fields = self.input_template.segments[-1]
+        if fields != ["name"] or any(literals):
+            raise ValueError(
+                f"Input path template {self.input_template.template!r} "
+                "must end with '/{name}'."
+            )
+
+    def input_path(
+        self,
+        input_path: Opath,
+        category="Misc",
+        folder="",
+        include_folder=False,
+        include_pathname=False,
+    ) -> Opath:
+        name = (
+            f"{input_path.parent.name}/{input_path.name}"
+            if include_folder
+            else input_path.name
+        )
+        rel_path = self.input_template.render(
+            {
+                "category": category,
+                "pathname": self.pathname if include_pathname else "",
+                "folder": folder,
+                "name": name,
+            }
+        )
+        return self.contents_dir / rel_path
+
+    def output_path(self, name, in_folder=False, category="Misc", suffix="") -> Opath:
+        suffix = suffix.removeprefix(".")
+        stem = f"{self.pathname}_{name}" if name else self.pathname
+        rel_path = self.output_template.render(
+            {
+                "category": category,
+                "pathname": self.pathname,
+                "name": name,
+                "stem": stem,
+                "folder": stem if in_folder else "",
+                "ext": f".{suffix}" if suffix else "",
+            }
+        )
+        return self.contents_dir / rel_path
@@ -1,6 +1,9 @@
 import bpy
 from pathlib import Path
 
+from .profiling import DumpProfile, ResetProfile, profile_stats
+from .utils import TRANSFER_STRATEGIES
+
 
 class OmoospacePreferences(bpy.types.AddonPreferences):
     bl_idname = __package__
@@ -11,8 +14,59 @@ class OmoospacePreferences(bpy.types.AddonPreferences):
         default=str(Path.home())
     )  # type: ignore
 
+    background_transfers: bpy.props.BoolProperty(
+        name="Background Transfers",
+        description="When saving into another omoospace, rewrite paths immediately and copy the files in the background",
+        default=False
+    )  # type: ignore
+
+    transfer_strategy: bpy.props.EnumProperty(
+        name="Transfer Strategy",
+        description="How files are put into the contents dir, unsupported strategies fall back to a copy. Saving into another omoospace only copies or reflinks",
+        items=TRANSFER_STRATEGIES,
+        default="COPY"
+    )  # type: ignore
+
+    profiling: bpy.props.BoolProperty(
+        name="Profile Handlers",
+        description="Time the load/save handlers and their stages, and count filesystem calls",
+        default=False
+    )  # type: ignore
+
     def draw(self, context):
         layout = self.layout
 
         layout.label(text="Configuration")
         layout.prop(self, 'omoospace_home')
+        layout.prop(self, 'background_transfers')
+        layout.prop(self, 'transfer_strategy')
+
+        layout.label(text="Profiling")
+        layout.prop(self, 'profiling')
+        if not profile_stats:
+            return
+
+        box = layout.box()
+        row = box.split(factor=0.5)
+        row.label(text="Stage")
+        row = row.split(factor=0.25)
+        row.label(text="Calls")
+        row = row.split(factor=0.33)
+        row.label(text="Total ms")
+        row = row.split(factor=0.5)
+        row.label(text="Max ms")
+        row.label(text="Syscalls")
+        for name, stats in sorted(profile_stats.items()):
+            row = box.split(factor=0.5)
+            row.label(text=name)
+            row = row.split(factor=0.25)
+            row.label(text=str(stats["calls"]))
+            row = row.split(factor=0.33)
+            row.label(text=f"{stats['total_ms']:.1f}")
+            row = row.split(factor=0.5)
+            row.label(text=f"{stats['max_ms']:.1f}")
+            row.label(text=str(stats["syscalls"]))
+
+        row = layout.row()
+        row.operator(DumpProfile.bl_idname)
+        row.operator(ResetProfile.bl_idname)
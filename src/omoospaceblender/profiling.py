@@ -0,0 +1,137 @@
+import bpy
+import builtins
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# "on_load_post/collect" -> {"calls", "total_ms", "max_ms", "syscalls"}
+profile_stats = {}
+
+_stack = []
+_syscalls = [0]
+_originals = {}
+
+COUNTED_SYSCALLS = (
+    (os, "stat"),
+    (os, "lstat"),
+    (os, "scandir"),
+    (os, "listdir"),
+    (os, "mkdir"),
+    (os, "unlink"),
+    (os, "rename"),
+    (builtins, "open"),
+)
+
+
+def is_profiling() -> bool:
+    try:
+        return bpy.context.preferences.addons[__package__].preferences.profiling
+    except (KeyError, AttributeError):
+        return False
+
+
+def install_syscall_counters():
+    for module, name in COUNTED_SYSCALLS:
+        function = getattr(module, name)
+        _originals[(module, name)] = function
+
+        @functools.wraps(function)
+        def counted(*args, __function=function, **kwargs):
+            _syscalls[0] += 1
+            return __function(*args, **kwargs)
+
+        setattr(module, name, counted)
+
+
+def remove_syscall_counters():
+    for (module, name), function in _originals.items():
+        setattr(module, name, function)
+    _originals.clear()
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block when profiling is enabled in the preferences.
+
+    Nested stages are recorded as "parent/child". Filesystem calls are
+    counted while the outermost stage runs.
+    """
+    if not is_profiling():
+        yield
+        return
+
+    _stack.append(name)
+    key = "/".join(_stack)
+    if len(_stack) == 1:
+        install_syscall_counters()
+
+    start_syscalls = _syscalls[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        _stack.pop()
+        if len(_stack) == 0:
+            remove_syscall_counters()
+
+        stats = profile_stats.setdefault(
+            key, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "syscalls": 0}
+        )
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed
+        stats["max_ms"] = max(stats["max_ms"], elapsed)
+        stats["syscalls"] += _syscalls[0] - start_syscalls
+
+
+def profiled(function):
+    """Run the whole function as a stage named after it."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with stage(function.__name__):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def dump_profile(filepath: str):
+    data = {
+        "blend_file": bpy.data.filepath,
+        "stages": profile_stats,
+    }
+    with open(filepath, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
+
+
+class DumpProfile(bpy.types.Operator):
+    bl_idname = "omoospace.dump_profile"
+    bl_label = "Dump Profile"
+    bl_description = "Write the handler timings to a JSON file"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")  # type: ignore
+    filter_glob: bpy.props.StringProperty(
+        default="*.json", options={"HIDDEN"}
+    )  # type: ignore
+
+    def invoke(self, context, event):
+        self.filepath = "omoospace_profile.json"
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        dump_profile(self.filepath)
+        self.report({"INFO"}, f"Profile saved to '{self.filepath}'")
+        return {"FINISHED"}
+
+
+class ResetProfile(bpy.types.Operator):
+    bl_idname = "omoospace.reset_profile"
+    bl_label = "Reset Profile"
+    bl_description = "Clear all recorded handler timings"
+
+    def execute(self, context):
+        profile_stats.clear()
+        return {"FINISHED"}
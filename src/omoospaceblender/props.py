@@ -6,6 +6,19 @@ class OMOOSPACE_OldPath(bpy.types.PropertyGroup):
     path: bpy.props.StringProperty()  # type: ignore
 
 
+def update_input_path_preview(self, context):
+    # imported here, manage_paths depends on this module
+    from .manage_paths import compute_input_path_preview
+
+    compute_input_path_preview(self)
+
+
+def update_output_path_preview(self, context):
+    from .manage_paths import compute_output_path_preview
+
+    compute_output_path_preview(self)
+
+
 class OMOOSPACE_InputPath(bpy.types.PropertyGroup):
     selected: bpy.props.BoolProperty(default=False)  # type: ignore
     icon: bpy.props.StringProperty(default="None")  # type: ignore
@@ -14,11 +27,26 @@ class OMOOSPACE_InputPath(bpy.types.PropertyGroup):
     parm: bpy.props.StringProperty()  # type: ignore
     path: bpy.props.StringProperty()  # type: ignore
 
-    category: bpy.props.StringProperty(default="Misc")  # type: ignore
-    folder: bpy.props.StringProperty(default="")  # type: ignore
-    include_pathname: bpy.props.BoolProperty(default=False)  # type: ignore
-    include_folder: bpy.props.BoolProperty(default=False)  # type: ignore
+    category: bpy.props.StringProperty(
+        default="Misc", update=update_input_path_preview
+    )  # type: ignore
+    folder: bpy.props.StringProperty(
+        default="", update=update_input_path_preview
+    )  # type: ignore
+    include_pathname: bpy.props.BoolProperty(
+        default=False, update=update_input_path_preview
+    )  # type: ignore
+    include_folder: bpy.props.BoolProperty(
+        default=False, update=update_input_path_preview
+    )  # type: ignore
     is_packed: bpy.props.BoolProperty(default=False)  # type: ignore
+    is_content: bpy.props.BoolProperty(default=False)  # type: ignore
+    # subspace files using it, from the usage index
+    subspace_users: bpy.props.IntProperty(default=0)  # type: ignore
+
+    # computed by update callbacks, read only when drawing
+    preview: bpy.props.StringProperty()  # type: ignore
+    preview_exists: bpy.props.BoolProperty(default=False)  # type: ignore
 
 
 class OMOOSPACE_OutputPath(bpy.types.PropertyGroup):
@@ -28,10 +56,18 @@ class OMOOSPACE_OutputPath(bpy.types.PropertyGroup):
     parm: bpy.props.StringProperty()  # type: ignore
     path: bpy.props.StringProperty()  # type: ignore
 
-    category: bpy.props.StringProperty(default="Misc")  # type: ignore
-    name: bpy.props.StringProperty()  # type: ignore
-    suffix: bpy.props.StringProperty()  # type: ignore
-    in_folder: bpy.props.BoolProperty(default=False)  # type: ignore
+    category: bpy.props.StringProperty(
+        default="Misc", update=update_output_path_preview
+    )  # type: ignore
+    name: bpy.props.StringProperty(update=update_output_path_preview)  # type: ignore
+    suffix: bpy.props.StringProperty(update=update_output_path_preview)  # type: ignore
+    in_folder: bpy.props.BoolProperty(
+        default=False, update=update_output_path_preview
+    )  # type: ignore
+    is_content: bpy.props.BoolProperty(default=False)  # type: ignore
+
+    # computed by update callbacks, read only when drawing
+    preview: bpy.props.StringProperty()  # type: ignore
 
 
 class OMOOSPACE_QuickDir(bpy.types.PropertyGroup):
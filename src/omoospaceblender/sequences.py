@@ -0,0 +1,135 @@
+"""Numbered file sequences, found by listing their folder once.
+
+Files of a folder are grouped by `prefix####suffix`, the frame is the last
+run of digits before the extension. Listings are cached per folder and
+used again while the folder mtime stays the same.
+"""
+
+import os
+import re
+
+SEQUENCE_TOKEN = "#"
+
+FRAME_PATTERN = re.compile(r"^(.*?)(\d+)(\D*)$")
+TOKEN_PATTERN = re.compile(r"^([^#]*)(#+)([^#]*)$")
+
+# normalized folder -> (st_mtime_ns, {(prefix, suffix): Sequence})
+_scans: dict[str, tuple] = {}
+
+
+class Sequence:
+    """Files of one folder named prefix + frame + suffix."""
+
+    def __init__(self, dir: str, prefix: str, suffix: str):
+        self.dir = dir
+        self.prefix = prefix
+        self.suffix = suffix
+        # (frame, file name), sorted by frame
+        self.frames: list[tuple[int, str]] = []
+
+    def __repr__(self):
+        first, last = self.frame_range
+        return f"Sequence({self.pattern!r}, {first}-{last}, {len(self)} files)"
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def pattern(self) -> str:
+        """File name with the frame as `#`, as wide as the shortest frame."""
+        affixes = len(self.prefix) + len(self.suffix)
+        padding = min(len(name) - affixes for _, name in self.frames)
+        return f"{self.prefix}{SEQUENCE_TOKEN * padding}{self.suffix}"
+
+    @property
+    def frame_range(self) -> tuple[int, int]:
+        return self.frames[0][0], self.frames[-1][0]
+
+    @property
+    def gaps(self) -> list[tuple[int, int]]:
+        """Missing frames between first and last, as inclusive ranges."""
+        gaps = []
+        for (frame, _), (next_frame, _) in zip(self.frames, self.frames[1:]):
+            if next_frame - frame > 1:
+                gaps.append((frame + 1, next_frame - 1))
+        return gaps
+
+    @property
+    def files(self) -> list[str]:
+        return [os.path.join(self.dir, name) for _, name in self.frames]
+
+
+def split_frame(name: str) -> tuple[str, str, str]:
+    """(prefix, frame, suffix) of a file name, None if it has no frame."""
+    stem, ext = os.path.splitext(name)
+    match = FRAME_PATTERN.match(stem)
+    if match is None:
+        return None
+    prefix, frame, rest = match.groups()
+    return prefix, frame, rest + ext
+
+
+def scan_sequences(dir) -> dict[tuple[str, str], Sequence]:
+    """Sequences of a folder by (prefix, suffix), in one scandir pass.
+
+    Single numbered files are sequences of one frame. Raises OSError if
+    the folder can not be listed.
+    """
+    dir = os.path.normpath(os.path.abspath(str(dir)))
+    key = os.path.normcase(dir)
+    try:
+        mtime = os.stat(dir).st_mtime_ns
+    except OSError:
+        _scans.pop(key, None)
+        raise
+
+    scan = _scans.get(key)
+    if scan is not None and scan[0] == mtime:
+        return scan[1]
+
+    sequences = {}
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            parts = split_frame(entry.name)
+            if parts is None or not entry.is_file():
+                continue
+            prefix, frame, suffix = parts
+            sequence = sequences.get((prefix, suffix))
+            if sequence is None:
+                sequence = sequences[(prefix, suffix)] = Sequence(dir, prefix, suffix)
+            sequence.frames.append((int(frame), entry.name))
+
+    for sequence in sequences.values():
+        sequence.frames.sort()
+
+    _scans[key] = (mtime, sequences)
+    return sequences
+
+
+def find_sequence(path) -> Sequence:
+    """Sequence of a frame file, or of a `prefix####suffix` path.
+
+    None if the name has no frame or no such file is in the folder.
+    """
+    dir, name = os.path.split(str(path))
+    match = TOKEN_PATTERN.match(name)
+    if match:
+        prefix, _, suffix = match.groups()
+    else:
+        parts = split_frame(name)
+        if parts is None:
+            return None
+        prefix, _, suffix = parts
+
+    try:
+        return scan_sequences(dir or ".").get((prefix, suffix))
+    except OSError:
+        return None
+
+
+def is_sequence_pattern(name: str) -> bool:
+    return TOKEN_PATTERN.match(name) is not None
+
+
+def clear_sequence_cache():
+    _scans.clear()
@@ -0,0 +1,214 @@
+import bpy
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .path_index import invalidate_path_index
+from .utils import COPY_WORKERS, copy_to
+
+_executor: ThreadPoolExecutor = None
+_watching = False
+
+# {"label": str, "future": Future, "paths": [(PathHandle, old_bpath, new_bpath)]}
+pending_transfers = []
+transfer_status = {"done": 0, "failed": 0}
+
+
+def queue_transfer(
+    src, dir, label: str = "", strategy: str = "COPY", paths: list = None
+) -> Future:
+    """Copy src into dir in the background, see WatchTransfers.
+
+    paths are the (handle, old_bpath, new_bpath) already set to the new
+    location, they are set back if the copy fails. The list may be extended
+    until the transfer is collected.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=COPY_WORKERS)
+
+    future = _executor.submit(copy_to, src, dir, strategy=strategy)
+    pending_transfers.append(
+        {
+            "label": label or str(src),
+            "future": future,
+            "paths": paths if paths is not None else [],
+        }
+    )
+    return future
+
+
+def has_pending_transfers() -> bool:
+    return len(pending_transfers) > 0
+
+
+def has_pending_paths() -> bool:
+    """Whether the current file refers to files not copied yet."""
+    return any(transfer["paths"] for transfer in pending_transfers)
+
+
+def forget_transfer_paths():
+    """Keep copying, but never touch the paths of the file being closed.
+
+    The watcher is stopped with the file, see WatchTransfers.cancel.
+    """
+    global _watching
+    _watching = False
+    for transfer in pending_transfers:
+        transfer["paths"] = []
+
+
+def start_watching_transfers():
+    """Start WatchTransfers from a timer, handlers can not run modal operators."""
+
+    def start():
+        if not has_pending_transfers():
+            return None
+
+        wm = bpy.context.window_manager
+        if len(wm.windows) == 0:
+            # background mode, no event loop to drain the queue
+            wait_transfers()
+            return None
+
+        with bpy.context.temp_override(window=wm.windows[0]):
+            if _watching:
+                # saved again, the file still refers to files not copied yet
+                if has_pending_paths():
+                    mark_dirty()
+            else:
+                bpy.ops.omoospace.watch_transfers("INVOKE_DEFAULT")
+        return None
+
+    bpy.app.timers.register(start, first_interval=0.1)
+
+
+def wait_transfers():
+    for transfer in pending_transfers:
+        transfer["future"].exception()
+    collect_transfers()
+
+
+def mark_dirty():
+    # the saved file refers to files that are not copied yet,
+    # keep it dirty until the transfers are finished.
+    bpy.ops.ed.undo_push(message="Omoospace Transfers")
+
+
+def restore_paths(transfer: dict) -> int:
+    """Set the paths of a failed transfer back, returns how many were set."""
+    restored = 0
+    for handle, old_bpath, new_bpath in transfer["paths"]:
+        try:
+            # changed again meanwhile, or the datablock is gone
+            if handle.get() != new_bpath:
+                continue
+            handle.set(old_bpath)
+        except ReferenceError:
+            continue
+        restored += 1
+
+    if restored:
+        invalidate_path_index()
+    return restored
+
+
+def collect_transfers() -> list[tuple[str, BaseException, int]]:
+    """Drop finished transfers from the queue, return the failed ones.
+
+    Paths of failed transfers are set back to their old location, with the
+    number of restored paths.
+    """
+    failed = []
+    for transfer in list(pending_transfers):
+        future: Future = transfer["future"]
+        if not future.done():
+            continue
+
+        pending_transfers.remove(transfer)
+        err = future.exception()
+        if err:
+            transfer_status["failed"] += 1
+            failed.append((transfer["label"], err, restore_paths(transfer)))
+        else:
+            transfer_status["done"] += 1
+
+    return failed
+
+
+def get_transfer_status_text() -> str:
+    return (
+        f"Omoospace: {len(pending_transfers)} file transfers pending, "
+        f"{transfer_status['done']} done, {transfer_status['failed']} failed"
+    )
+
+
+class WatchTransfers(bpy.types.Operator):
+    bl_idname = "omoospace.watch_transfers"
+    bl_label = "Watch Background Transfers"
+    bl_description = "Wait for background file transfers and report the results"
+
+    _timer = None
+
+    def invoke(self, context, event):
+        global _watching
+        if _watching or not has_pending_transfers():
+            return {"CANCELLED"}
+
+        _watching = True
+        transfer_status["done"] = 0
+        transfer_status["failed"] = 0
+
+        if has_pending_paths():
+            mark_dirty()
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        context.workspace.status_text_set(get_transfer_status_text())
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        restored = 0
+        for label, err, count in collect_transfers():
+            note = ", path restored" if count else ""
+            self.report({"WARNING"}, f"Fail to copy '{label}'{note}: {err}")
+            restored += count
+        if restored:
+            # restored paths are not saved yet
+            mark_dirty()
+
+        if has_pending_transfers():
+            context.workspace.status_text_set(get_transfer_status_text())
+            return {"PASS_THROUGH"}
+
+        return self.finish(context)
+
+    def cancel(self, context):
+        # e.g. another file is loaded, a new watcher starts after loading
+        global _watching
+        _watching = False
+
+        context.window_manager.event_timer_remove(self._timer)
+        if context.workspace:
+            context.workspace.status_text_set(None)
+
+    def finish(self, context):
+        self.cancel(context)
+
+        if transfer_status["failed"]:
+            self.report({"ERROR"}, get_transfer_status_text())
+        else:
+            self.report(
+                {"INFO"},
+                f"Omoospace: {transfer_status['done']} file transfers finished",
+            )
+        return {"FINISHED"}
+
+
+def unregister():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,305 @@
+"""Which subspace files use which contents, for the whole omoospace.
+
+Subspace files are read with blend_reader, no Blender needed. The index is
+a sqlite file in the contents dir, a file is only read again when its mtime
+or size changed.
+
+Usage:
+    python src/omoospaceblender/usage_index.py <omoospace> [--orphans]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import struct
+import sys
+from typing import TYPE_CHECKING
+
+try:
+    from .blend_reader import read_blend_paths
+    from .path_records import InputPathRecord, OutputPathRecord
+except ImportError:
+    # run as a script, without the add-on (and bpy) around
+    from blend_reader import read_blend_paths
+    from path_records import InputPathRecord, OutputPathRecord
+
+if TYPE_CHECKING:
+    from omoospace import Omoospace, Opath
+
+USAGE_INDEX = ".omoospace_usage.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subspaces (
+    blend TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS usages (
+    content TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    blend TEXT NOT NULL,
+    parm TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usages_content ON usages (content);
+CREATE INDEX IF NOT EXISTS usages_blend ON usages (blend);
+"""
+
+
+def resolve_bpath(bpath: str, blend_file) -> str:
+    """Real, normalized path of a blender path, relative to blend_file.
+
+    Symlinks are resolved like the contents dir of `UsageIndex`, so a
+    content is found whichever way the file or the path points to it.
+    """
+    if bpath.startswith("//"):
+        bpath = os.path.join(os.path.dirname(str(blend_file)), bpath[2:])
+    return os.path.normcase(os.path.realpath(bpath))
+
+
+def get_input_usage(record: InputPathRecord, blend_file) -> tuple[str, bool]:
+    """(path, is_dir) an input uses, a sequence or UDIM uses its whole folder."""
+    path = resolve_bpath(record.path, blend_file)
+    is_dir = record.parm.endswith(".directory")
+    if record.is_sequence or "<UDIM>" in path:
+        path = os.path.dirname(path)
+        is_dir = True
+    return path, is_dir
+
+
+def get_output_usage(record: OutputPathRecord, blend_file) -> str:
+    """Folder an output writes to, bakes are folders, renders files in one."""
+    path = resolve_bpath(record.path, blend_file)
+    if record.category == "GeometryNodes":
+        return path
+    return os.path.dirname(path)
+
+
+def get_content_key(path: str, contents_dir: str) -> str:
+    """Path relative to contents dir as posix, None if it is not a content."""
+    prefix = contents_dir.rstrip(os.sep) + os.sep
+    if not path.startswith(prefix):
+        return None
+    return path[len(prefix) :].replace(os.sep, "/")
+
+
+class UsageIndex:
+    """Reverse index of content usage, keyed by path relative to contents dir."""
+
+    def __init__(self, omoospace: Omoospace):
+        from omoospace import Opath
+
+        self.root_dir = Opath(omoospace.root_dir).resolve()
+        self.subspaces_dir = Opath(omoospace.subspaces_dir).resolve()
+        contents_dir = Opath(omoospace.contents_dir).resolve()
+        self.contents_dir = contents_dir
+        self.contents_key = os.path.normcase(str(contents_dir))
+
+        contents_dir.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(contents_dir / USAGE_INDEX, timeout=5)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def get_blend_key(self, blend_file) -> str:
+        from omoospace import Opath
+
+        return Opath(blend_file).resolve().relative_to(self.root_dir).as_posix()
+
+    def read_usages(self, blend_file) -> list[tuple]:
+        """(content, is_dir, parm, category) of the contents a file uses.
+
+        Inputs and the folders of outputs and bakes count, and what the
+        libraries it links from the contents dir use, at any depth.
+        """
+        usages = []
+        # (file, parm of the library it is linked by)
+        files = [(blend_file, "")]
+        read = set()
+        while files:
+            file, via = files.pop()
+            try:
+                inputs, outputs = read_blend_paths(file)
+            except (OSError, ValueError, struct.error):
+                if not via:
+                    raise
+                # a missing or broken library uses nothing
+                continue
+
+            for record in inputs.values():
+                if record.is_packed:
+                    continue
+
+                path, is_dir = get_input_usage(record, file)
+                content = get_content_key(path, self.contents_key)
+                if content is None:
+                    continue
+
+                parm = f"{via} > {record.parm}" if via else record.parm
+                usages.append((content, int(is_dir), parm, record.category))
+                if record.category == "Libraries" and path not in read:
+                    read.add(path)
+                    files.append((path, parm))
+
+            for record in outputs.values():
+                if not record.path:
+                    continue
+
+                content = get_content_key(
+                    get_output_usage(record, file), self.contents_key
+                )
+                if content is not None:
+                    parm = f"{via} > {record.parm}" if via else record.parm
+                    usages.append((content, 1, parm, record.category))
+
+        return usages
+
+    def update_file(self, blend_file, stat: os.stat_result = None):
+        """Index one subspace file again."""
+        blend = self.get_blend_key(blend_file)
+        stat = stat or os.stat(blend_file)
+        usages = self.read_usages(blend_file)
+
+        with self.connection:
+            self.connection.execute("DELETE FROM usages WHERE blend = ?", (blend,))
+            self.connection.executemany(
+                "INSERT INTO usages VALUES (?, ?, ?, ?, ?)",
+                [
+                    (content, is_dir, blend, parm, category)
+                    for content, is_dir, parm, category in usages
+                ],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO subspaces VALUES (?, ?, ?)",
+                (blend, stat.st_mtime_ns, stat.st_size),
+            )
+
+    def update(self) -> dict:
+        """Index subspace files changed since last update, drop removed ones."""
+        known = {
+            blend: (mtime_ns, size)
+            for blend, mtime_ns, size in self.connection.execute(
+                "SELECT blend, mtime_ns, size FROM subspaces"
+            )
+        }
+
+        result = {"updated": 0, "removed": 0, "unchanged": 0, "failed": []}
+        for blend_file in self.subspaces_dir.rglob("*.blend"):
+            blend = self.get_blend_key(blend_file)
+            stat = blend_file.stat()
+            if known.pop(blend, None) == (stat.st_mtime_ns, stat.st_size):
+                result["unchanged"] += 1
+                continue
+
+            try:
+                self.update_file(blend_file, stat)
+            except (OSError, ValueError, struct.error) as err:
+                result["failed"].append((blend, str(err)))
+                continue
+            result["updated"] += 1
+
+        with self.connection:
+            for blend in known:
+                self.connection.execute("DELETE FROM usages WHERE blend = ?", (blend,))
+                self.connection.execute("DELETE FROM subspaces WHERE blend = ?", (blend,))
+                result["removed"] += 1
+
+        return result
+
+    def get_users(self, content: str) -> list[str]:
+        """Subspace files (relative to the omoospace) using a content."""
+        rows = self.connection.execute(
+            "SELECT DISTINCT blend FROM usages WHERE content = ? ORDER BY blend",
+            (content,),
+        )
+        return [blend for (blend,) in rows]
+
+    def count_users(self, contents: list[str]) -> dict[str, int]:
+        """Number of subspace files using each content, in one query."""
+        counts = dict.fromkeys(contents, 0)
+        if not counts:
+            return counts
+
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (content TEXT)")
+        with self.connection:
+            self.connection.execute("DELETE FROM wanted")
+            self.connection.executemany(
+                "INSERT INTO wanted VALUES (?)", [(content,) for content in counts]
+            )
+        rows = self.connection.execute(
+            "SELECT usages.content, COUNT(DISTINCT usages.blend) FROM usages "
+            "JOIN wanted ON usages.content = wanted.content GROUP BY usages.content"
+        )
+        counts.update(rows)
+        return counts
+
+    def find_orphans(self) -> list[Opath]:
+        """Content files no subspace file uses, directly or by their folder."""
+        from omoospace import Opath
+
+        used_files = set()
+        used_dirs = set()
+        for content, is_dir in self.connection.execute(
+            "SELECT DISTINCT content, is_dir FROM usages"
+        ):
+            (used_dirs if is_dir else used_files).add(content)
+
+        orphans = []
+        for dir, dirnames, filenames in os.walk(self.contents_dir):
+            rel_dir = os.path.relpath(dir, self.contents_dir)
+            if rel_dir == ".":
+                rel_dir = ""
+            rel_dir = os.path.normcase(rel_dir).replace(os.sep, "/")
+            if rel_dir in used_dirs:
+                dirnames.clear()
+                continue
+
+            for filename in filenames:
+                # index files, e.g. this one
+                if filename.startswith("."):
+                    continue
+                content = f"{rel_dir}/{filename}" if rel_dir else filename
+                if os.path.normcase(content) not in used_files:
+                    orphans.append(Opath(dir) / filename)
+
+        return orphans
+
+
+def main(argv: list[str] = None):
+    from omoospace import Omoospace
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("omoospace", help="Any path inside the omoospace")
+    parser.add_argument("--orphans", action="store_true", help="List unused contents")
+    args = parser.parse_args(argv)
+
+    try:
+        omoospace = Omoospace(args.omoospace)
+    except FileNotFoundError as err:
+        parser.error(str(err))
+
+    with UsageIndex(omoospace) as index:
+        result = index.update()
+        for blend, err in result["failed"]:
+            print(f"{blend}: fail to read, {err}", file=sys.stderr)
+        print(
+            f"{result['updated']} updated, {result['unchanged']} unchanged, "
+            f"{result['removed']} removed, {len(result['failed'])} failed"
+        )
+
+        if args.orphans:
+            for orphan in index.find_orphans():
+                print(orphan)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,130 @@
+from __future__ import annotations
+
+import functools
+import hashlib
 import json
-from typing import Any
+import mmap
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
 import bpy
-from omoospace import Omoospace, Opath, extract_pathname
+
+from .path_template import PathRenderer
+from .sequences import SEQUENCE_TOKEN, find_sequence
+
+if TYPE_CHECKING:
+    from omoospace import Omoospace, Opath
 
 SUBSPACE_JSON = "omoospace_subspace.json"
+UDIM_TOKEN = "<UDIM>"
+HASH_INDEX = ".omoospace_hash_index.json"
+HASH_CHUNK = 1 << 20
+
+# linux ioctl, clone a file copy-on-write (btrfs, xfs, bcachefs...)
+FICLONE = 0x40049409
+
+TRANSFER_STRATEGIES = (
+    ("COPY", "Copy", "Copy the bytes, the safest"),
+    (
+        "REFLINK",
+        "Reflink",
+        "Copy-on-write clone when the filesystem supports it, else copy",
+    ),
+    (
+        "HARDLINK",
+        "Hardlink",
+        "Hardlink on the same volume, else copy. Both paths share edits",
+    ),
+    ("MOVE", "Move", "Move the source, a rename on the same volume"),
+)
+
+# leave the source where it was and independent of the copy, e.g. when a
+# file is saved into another omoospace. A hardlink shares the edits.
+KEEP_SOURCE_STRATEGIES = {"COPY", "REFLINK"}
+
+# blend filepath -> {"mtime": ..., "checked": ..., "omoospace": ..., "pathname": ...}
+_omoospace_cache = {}
+# seconds a saved file is known to be in no omoospace before looking again
+NO_OMOOSPACE_TTL = 2.0
+_omoospace_cache_info = {"hits": 0, "misses": 0}
+
+# bounded, copies are I/O bound
+COPY_WORKERS = min(8, (os.cpu_count() or 1) + 4)
 
 
 def bpath_to_opath(bpath: str, blend_file: str = None) -> Opath:
+    from omoospace import Opath
+
     start = Opath(blend_file).parent if blend_file else None
     return Opath(bpy.path.abspath(bpath, start=start)).resolve()
 
 
 def opath_to_bpath(path: Opath, blend_file: str = None) -> str:
+    from omoospace import Opath
+
     start = Opath(blend_file).parent if blend_file else None
     return bpy.path.relpath(str(path.resolve()), start=start)
 
 
+class PathHandle:
+    """Settable reference to a path property, e.g. (image, "filepath")."""
+
+    __slots__ = ("owner", "attr")
+
+    def __init__(self, owner, attr: str):
+        self.owner = owner
+        self.attr = attr
+
+    def get(self) -> str:
+        return getattr(self.owner, self.attr)
+
+    def set(self, value: str):
+        setattr(self.owner, self.attr, value)
+
+
+def apply_paths(handles: list[PathHandle], values: list[str]):
+    """Set a batch of paths, handles are anything with a set(value) method."""
+    for handle, value in zip(handles, values):
+        handle.set(value)
+
+
 def is_content(bpath: str):
     omoospace = get_omoospace()
     return omoospace.is_content(bpath_to_opath(bpath), False)
 
 
+def classify_contents(bpaths: list[str]) -> list[bool]:
+    """Batch version of is_content, the contents dir is resolved only once.
+
+    Paths are compared by normalized prefix. Their folders are resolved like
+    the contents dir, once per folder, so symlinks on the way do not matter.
+    """
+    omoospace = get_omoospace()
+    if not omoospace:
+        return [False] * len(bpaths)
+
+    contents_dir = os.path.normcase(str(omoospace.contents_dir.resolve()))
+    contents_prefix = contents_dir.rstrip(os.sep) + os.sep
+    blend_dir = os.path.dirname(bpy.data.filepath)
+
+    real_dirs = {}
+    flags = []
+    for bpath in bpaths:
+        path = bpy.path.abspath(bpath, start=blend_dir)
+        dir, name = os.path.split(os.path.normpath(path))
+        real_dir = real_dirs.get(dir)
+        if real_dir is None:
+            real_dir = real_dirs[dir] = os.path.normcase(os.path.realpath(dir))
+        path = os.path.join(real_dir, os.path.normcase(name))
+        flags.append(path.startswith(contents_prefix))
+
+    return flags
+
+
 def is_sequence(bpath: str):
     path = bpath_to_opath(bpath)
     last = path.stem.split(".")[-1]
@@ -31,70 +135,791 @@ def get_type(cls):
     return type(cls).__name__
 
 
-def copy_to(src, dir):
+def iter_tiles(src: Opath):
+    """Yield the os.DirEntry of every tile matching a `<UDIM>` filename."""
+    prefix, _, suffix = src.name.partition(UDIM_TOKEN)
+    size = len(prefix) + 4 + len(suffix)
+
+    with os.scandir(src.parent) as entries:
+        for entry in entries:
+            name = entry.name
+            if (
+                len(name) == size
+                and name.startswith(prefix)
+                and name.endswith(suffix)
+                and name[len(prefix) : len(prefix) + 4].isdigit()
+                and entry.is_file()
+            ):
+                yield entry
+
+
+def copy_tiles(
+    src,
+    dir,
+    incremental: bool = False,
+    hash_index: dict = None,
+    max_workers: int = COPY_WORKERS,
+    strategy: str = "COPY",
+) -> dict[str, list[Opath]]:
+    """Copy all tiles of a `<UDIM>` path into dir concurrently.
+
+    Existing tiles are kept, or synced like `sync_file` when incremental.
+
+    Returns:
+        dict[str, list[Opath]]: Manifest of "copied" and "skipped" destinations.
+    """
+    from omoospace import Opath
+
+    src = Opath(src)
+    dir = Opath(dir)
+
+    tiles = list(iter_tiles(src))
+    if len(tiles) == 0:
+        raise FileNotFoundError(f"Source file not found: {src}")
+
+    def copy_tile(tile: os.DirEntry) -> bool:
+        dst = dir / tile.name
+        if incremental:
+            return sync_file(tile.path, dst, hash_index, strategy)
+        try:
+            transfer_file(tile.path, dst, strategy)
+        except FileExistsError:
+            return False
+        return True
+
+    dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        copied = list(executor.map(copy_tile, tiles))
+
+    manifest = {"copied": [], "skipped": []}
+    for tile, is_copied in zip(tiles, copied):
+        manifest["copied" if is_copied else "skipped"].append(dir / tile.name)
+    return manifest
+
+
+def get_sequence_source(path) -> Opath:
+    """`prefix####suffix` path of the sequence path is a frame of.
+
+    The path itself when it is the only frame, or not found.
+    """
+    from omoospace import Opath
+
+    path = Opath(path)
+    sequence = find_sequence(path)
+    if sequence is None or len(sequence) < 2:
+        return path
+    return path.parent / sequence.pattern
+
+
+def copy_frames(
+    src,
+    dir,
+    incremental: bool = False,
+    hash_index: dict = None,
+    max_workers: int = COPY_WORKERS,
+    strategy: str = "COPY",
+) -> list[Opath]:
+    """Copy the frames of a `prefix####suffix` path into dir concurrently.
+
+    Other files of the source folder are left out. Returns the copied files.
+    """
+    from omoospace import Opath
+
+    src = Opath(src)
+    dir = Opath(dir)
+
+    sequence = find_sequence(src)
+    if sequence is None:
+        raise FileNotFoundError(f"Source file not found: {src}")
+
+    def copy_frame(name: str) -> bool:
+        src_file = src.parent / name
+        dst = dir / name
+        if incremental:
+            return sync_file(src_file, dst, hash_index, strategy)
+        try:
+            transfer_file(src_file, dst, strategy)
+        except FileExistsError:
+            return False
+        return True
+
+    names = [name for _, name in sequence.frames]
+    dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        copied = list(executor.map(copy_frame, names))
+
+    return [dir / name for name, is_copied in zip(names, copied) if is_copied]
+
+
+def reflink_file(src, dst) -> bool:
+    """Clone src to dst with FICLONE, returns False when not supported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    with open(src, "rb") as src_file:
+        with open(dst, "xb") as dst_file:
+            try:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+                cloned = True
+            except OSError:
+                cloned = False
+
+    if not cloned:
+        os.remove(dst)
+        return False
+
+    shutil.copystat(src, dst)
+    return True
+
+
+def get_temp_path(dst) -> str:
+    """Unique file beside dst, per process and thread."""
+    return f"{dst}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def publish_file(tmp, dst, replace: bool = False):
+    """Put a finished temp file at dst in one step.
+
+    Other processes never see a partial dst. Without replace, raises
+    FileExistsError if dst showed up meanwhile and tmp is removed.
+    """
+    if replace:
+        os.replace(tmp, dst)
+        return
+
+    try:
+        # unlike a rename, a link never replaces an existing dst
+        os.link(tmp, dst, follow_symlinks=False)
+    except FileExistsError:
+        os.remove(tmp)
+        raise
+    except OSError:
+        # no hardlinks on this filesystem
+        if os.path.lexists(dst):
+            os.remove(tmp)
+            raise FileExistsError(f"File already exists: {dst}")
+        os.replace(tmp, dst)
+        return
+    os.remove(tmp)
+
+
+def place_file(src, dst, strategy: str) -> str:
+    """Put src at a dst that does not exist yet. Returns the strategy used."""
+    if strategy == "REFLINK" and reflink_file(src, dst):
+        return "REFLINK"
+
+    if strategy == "HARDLINK":
+        try:
+            os.link(src, dst)
+            return "HARDLINK"
+        except OSError:
+            # e.g. across volumes, or not supported by the filesystem
+            pass
+
+    shutil.copy2(src, dst)
+    return "COPY"
+
+
+def transfer_file(src, dst, strategy: str = "COPY", replace: bool = False) -> str:
+    """Put src at dst, falls back to a copy if the strategy is not supported.
+
+    The file is written beside dst and put in place at once, so processes
+    writing the same dst do not see or leave a partial file. Raises
+    FileExistsError if dst exists, unless replace. Returns the strategy used.
+    """
+    if not replace and os.path.lexists(dst):
+        raise FileExistsError(f"File already exists: {dst}")
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+
+    if strategy == "MOVE":
+        if replace and os.path.lexists(dst):
+            os.remove(dst)
+        # a rename on the same volume, copy and delete across volumes
+        shutil.move(src, dst)
+        return "MOVE"
+
+    tmp = get_temp_path(dst)
+    try:
+        used = place_file(src, tmp, strategy)
+        publish_file(tmp, dst, replace)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        raise
+    return used
+
+
+def replace_file(src, dst, strategy: str = "COPY") -> str:
+    """Like transfer_file, but an existing dst is replaced."""
+    return transfer_file(src, dst, strategy, replace=True)
+
+
+def transfer_to(src, dir, strategy: str = "COPY") -> list[Opath]:
+    """Opath.copy_to with a strategy, existing files are kept.
+
+    Returns the transferred files.
+    """
+    from omoospace import Opath
+
+    src = Opath(src)
+    dst_root = Opath(dir) / src.name
+
+    if strategy == "MOVE" and not os.path.lexists(dst_root):
+        dst_root.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # a whole folder in one rename
+            os.rename(src, dst_root)
+            return [dst_root]
+        except OSError:
+            pass
+
+    if src.is_dir():
+        pairs = [
+            (Opath(root, name), dst_root / Opath(root).relative_to(src) / name)
+            for root, _, files in os.walk(src)
+            for name in files
+        ]
+    else:
+        pairs = [(src, dst_root)]
+
+    transferred = []
+    for src_file, dst in pairs:
+        try:
+            transfer_file(src_file, dst, strategy)
+        except FileExistsError:
+            continue
+        transferred.append(dst)
+
+    return transferred
+
+
+def hash_file(path) -> str:
+    """Hash a file with blake2b, streamed through mmap in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        # empty files can not be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return digest.hexdigest()
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with memoryview(data) as view:
+                for start in range(0, len(view), HASH_CHUNK):
+                    digest.update(view[start : start + HASH_CHUNK])
+
+    return digest.hexdigest()
+
+
+def get_file_hash(path, stat: os.stat_result, hash_index: dict = None) -> str:
+    key = str(path)
+    entry = hash_index.get(key) if hash_index is not None else None
+    if (
+        entry
+        and entry[2] is not None
+        and entry[0] == stat.st_size
+        and entry[1] == stat.st_mtime_ns
+    ):
+        return entry[2]
+
+    file_hash = hash_file(path)
+    if hash_index is not None:
+        hash_index[key] = [stat.st_size, stat.st_mtime_ns, file_hash]
+        # keep which source a destination was written from
+        if entry and len(entry) > 3:
+            hash_index[key].append(entry[3])
+
+    return file_hash
+
+
+def get_source_key(src) -> str:
+    return os.path.normcase(os.path.abspath(src))
+
+
+def get_synced_source(dst, hash_index: dict = None) -> str:
+    """Source key sync_file last wrote dst from, None if unknown."""
+    entry = hash_index.get(str(dst)) if hash_index is not None else None
+    return entry[3] if entry and len(entry) > 3 else None
+
+
+def read_hash_index(path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_hash_index(contents_dir) -> dict:
+    from omoospace import Opath
+
+    contents_dir = Opath(contents_dir).resolve()
+    data = read_hash_index(contents_dir / HASH_INDEX)
+    return {str(contents_dir / key): entry for key, entry in data.items()}
+
+
+@contextmanager
+def lock_file(path, timeout: float = 30):
+    """Hold `path` as a lock file, shared by processes.
+
+    A lock older than timeout is left from a crashed process and is taken
+    over. Raises TimeoutError if the lock is not released in time.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(path).st_mtime > timeout:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"File is locked: {path}")
+            time.sleep(0.05)
+
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def save_hash_index(contents_dir, hash_index: dict):
+    """Merge hash_index into the one on disk.
+
+    Other processes may save the same index, so it is read again under a
+    lock, the entry of the newer file wins.
+    """
+    from omoospace import Opath
+
+    contents_dir = Opath(contents_dir).resolve()
+
+    # only files under contents dir are worth to remember
+    data = {}
+    for key, entry in hash_index.items():
+        try:
+            data[Opath(key).relative_to(contents_dir).as_posix()] = entry
+        except ValueError:
+            continue
+
+    if not data:
+        return
+
+    contents_dir.mkdir(parents=True, exist_ok=True)
+    path = contents_dir / HASH_INDEX
+    with lock_file(f"{path}.lock"):
+        merged = read_hash_index(path)
+        for key, entry in data.items():
+            saved = merged.get(key)
+            if saved is None or saved[1] <= entry[1]:
+                merged[key] = entry
+
+        tmp = get_temp_path(path)
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(merged, file, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+def sync_file(src, dst, hash_index: dict = None, strategy: str = "COPY") -> bool:
+    """Copy src to dst only if dst differs. Returns True if copied.
+
+    Size and mtime are compared first, the content hash only when the size
+    matches but the mtime does not. A differing dst is only replaced when it
+    was written from the same src, as recorded in hash_index, otherwise it
+    belongs to another file and FileExistsError is raised.
+    """
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+
+    if dst_stat is not None and src_stat.st_size == dst_stat.st_size:
+        if int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+            return False
+
+        src_hash = get_file_hash(src, src_stat, hash_index)
+        if src_hash == get_file_hash(dst, dst_stat, hash_index):
+            # align mtime, next time a stat is enough
+            os.utime(dst, ns=(dst_stat.st_atime_ns, src_stat.st_mtime_ns))
+            if hash_index is not None:
+                hash_index[str(dst)] = [
+                    dst_stat.st_size,
+                    src_stat.st_mtime_ns,
+                    src_hash,
+                    get_source_key(src),
+                ]
+            return False
+
+    if dst_stat is not None:
+        if get_synced_source(dst, hash_index) != get_source_key(src):
+            raise FileExistsError(f"Conflict, a different file already exists: {dst}")
+        replace_file(src, dst, strategy)
+    else:
+        try:
+            transfer_file(src, dst, strategy)
+        except FileExistsError:
+            # written by another process meanwhile, compare again
+            return sync_file(src, dst, hash_index, strategy)
+
+    if hash_index is not None:
+        dst_stat = os.stat(dst)
+        # hash is computed when needed
+        hash_index[str(dst)] = [
+            dst_stat.st_size,
+            dst_stat.st_mtime_ns,
+            None,
+            get_source_key(src),
+        ]
+    return True
+
+
+def sync_to(
+    src, dir, hash_index: dict = None, strategy: str = "COPY"
+) -> list[Opath]:
+    """Incremental version of Opath.copy_to, returns the copied files."""
+    from omoospace import Opath
+
+    src = Opath(src)
+    dst_root = Opath(dir) / src.name
+
+    if src.is_dir():
+        pairs = (
+            (Opath(root, name), dst_root / Opath(root).relative_to(src) / name)
+            for root, _, files in os.walk(src)
+            for name in files
+        )
+    else:
+        pairs = [(src, dst_root)]
+
+    return [dst for src, dst in pairs if sync_file(src, dst, hash_index, strategy)]
+
+
+def copy_to(
+    src,
+    dir,
+    incremental: bool = False,
+    hash_index: dict = None,
+    strategy: str = "COPY",
+):
+    from omoospace import Opath
+
     src = Opath(src).resolve()
     dir = Opath(dir).resolve()
 
+    if src == dir / src.name:
+        return src
+
+    if UDIM_TOKEN in src.name:
+        return copy_tiles(src, dir, incremental, hash_index, strategy=strategy)
+
     if not src.exists():
+        if SEQUENCE_TOKEN in src.name:
+            return copy_frames(src, dir, incremental, hash_index, strategy=strategy)
         raise FileNotFoundError(f"Source file not found: {src}")
 
-    if src == dir / src.name:
-        return src
+    if incremental:
+        return sync_to(src, dir, hash_index, strategy)
+
+    if strategy != "COPY":
+        return transfer_to(src, dir, strategy)
 
     try:
-        if "<UDIM>" in str(src):
-            udims = src.parent.glob(src.name.replace("<UDIM>", "*"))
-            for udim in udims:
-                return Opath(udim).copy_to(dir)
-        else:
-            return Opath(src).copy_to(dir)
+        return Opath(src).copy_to(dir)
     except FileExistsError:
         pass
     except Exception as err:
         raise err
 
 
-def get_omoospace():
+@functools.cache
+def get_cached_omoospace_class() -> type:
+    """Omoospace which parses its profile file only once.
+
+    Defined on first use, omoospace is only imported when needed.
+    """
+    from omoospace import Omoospace
+
+    class CachedOmoospace(Omoospace):
+        _profile_data = None
+
+        def _read_profile(self):
+            if self._profile_data is None:
+                self._profile_data = super()._read_profile()
+            return self._profile_data
+
+        def _write_profile(self, data):
+            super()._write_profile(data)
+            self._profile_data = None
+
+    return CachedOmoospace
+
+
+def get_profile_mtime(omoospace: Omoospace):
     try:
-        blend_path = Opath(bpy.data.filepath)
-        omoospace = Omoospace(blend_path)
-        return omoospace
-    except:
+        return os.stat(omoospace.profile_file).st_mtime_ns
+    except (OSError, TypeError):
         return None
 
 
-def get_pathname():
-    blend_path = Opath(bpy.data.filepath)
-    return extract_pathname(blend_path)
+def write_packed_files(owner, dst) -> list[Opath]:
+    """Write the packed data of a datablock straight to dst.
 
+    Works for anything with `packed_file` (images, sounds, volumes,
+    libraries). Multi-file images (e.g. UDIM tiles) are written next to dst,
+    each under its own file name. Existing files are kept.
+    """
+    from omoospace import Opath
 
-def get_subspace_data(key: str) -> Any:
-    # 检查文本数据块是否存在
-    if SUBSPACE_JSON not in bpy.data.texts:
-        bpy.data.texts.new(SUBSPACE_JSON)
+    dst = Opath(dst)
+    packed_files = getattr(owner, "packed_files", None)
 
-    # 加载并解析数据
-    subspace_text = bpy.data.texts[SUBSPACE_JSON]
-    try:
-        subspace_data = json.loads(subspace_text.as_string())
-    except:
-        subspace_data = {}
+    if packed_files is not None and len(packed_files) > 1:
+        targets = [
+            (packed_file, dst.parent / Opath(packed_file.filepath).name)
+            for packed_file in packed_files
+        ]
+    else:
+        targets = [(owner.packed_file, dst)]
 
-    return subspace_data.get(key, None)
+    written = []
+    for packed_file, target in targets:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(target, "xb") as file:
+                file.write(packed_file.data)
+        except FileExistsError:
+            continue
+        written.append(target)
 
+    return written
 
-def set_subspace_data(key: str, value: Any):
-    # 获取或创建文本数据块
-    if SUBSPACE_JSON not in bpy.data.texts:
-        bpy.data.texts.new(SUBSPACE_JSON)
 
-    subspace_text = bpy.data.texts[SUBSPACE_JSON]
+def get_transfer_key(src, dir) -> tuple[str, str]:
+    return (
+        os.path.normcase(os.path.abspath(src)),
+        os.path.normcase(os.path.abspath(dir)),
+    )
+
+
+def group_transfers(transfers: list[tuple]) -> list[list[int]]:
+    """Indices of (src, dir) pairs with the same source and destination."""
+    groups = {}
+    for index, (src, dir) in enumerate(transfers):
+        groups.setdefault(get_transfer_key(src, dir), []).append(index)
+    return list(groups.values())
+
+
+def get_transfer_size(src) -> int:
+    """Bytes a copy of src moves, a folder, `<UDIM>` set or sequence as a whole."""
+    from omoospace import Opath
+
+    src = Opath(src)
     try:
-        subspace_data = json.loads(subspace_text.as_string())
-    except:
-        subspace_data = {}
+        if UDIM_TOKEN in src.name:
+            return sum(entry.stat().st_size for entry in iter_tiles(src))
+
+        if SEQUENCE_TOKEN in src.name and not src.exists():
+            sequence = find_sequence(src)
+            files = sequence.files if sequence else []
+            return sum(os.path.getsize(file) for file in files)
 
-    subspace_data[key] = value
+        if src.is_dir():
+            return sum(
+                os.path.getsize(os.path.join(dir, filename))
+                for dir, _, filenames in os.walk(src)
+                for filename in filenames
+            )
 
-    subspace_text.clear()
-    subspace_text.write(json.dumps(subspace_data, indent=4))
+        return src.stat().st_size
+    except OSError:
+        return 0
+
+
+def get_duplicate_size(transfers: list[tuple]) -> int:
+    """Bytes not copied again thanks to group_transfers."""
+    return sum(
+        get_transfer_size(transfers[indices[0]][0]) * (len(indices) - 1)
+        for indices in group_transfers(transfers)
+        if len(indices) > 1
+    )
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def copy_all(transfers: list[tuple], max_workers: int = COPY_WORKERS, **kwargs):
+    """Copy (src, dir) pairs concurrently in a bounded thread pool.
+
+    Yields (index, error) in completion order on the calling thread, so
+    bpy data can be changed safely as soon as each copy finishes. Pairs with
+    the same source and destination are copied once, every index of them is
+    yielded with its result. Extra keyword arguments are passed to copy_to.
+
+    Moves run one at a time, files before folders, so a folder is not
+    renamed while a file in it is still being moved out.
+    """
+    groups = group_transfers(transfers)
+    if kwargs.get("strategy") == "MOVE":
+        max_workers = 1
+        groups.sort(key=lambda indices: os.path.isdir(transfers[indices[0]][0]))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(copy_to, *transfers[indices[0]], **kwargs): indices
+            for indices in groups
+        }
+        for future in as_completed(futures):
+            err = future.exception()
+            for index in futures[future]:
+                yield index, err
+
+
+def get_omoospace_cache_entry():
+    filepath = bpy.data.filepath
+    entry = _omoospace_cache.get(filepath)
+
+    if entry is not None:
+        omoospace = entry["omoospace"]
+        if omoospace is None:
+            # a profile may be created above the file meanwhile
+            fresh = (
+                not filepath
+                or time.monotonic() - entry["checked"] < NO_OMOOSPACE_TTL
+            )
+        else:
+            fresh = get_profile_mtime(omoospace) == entry["mtime"]
+        if fresh:
+            _omoospace_cache_info["hits"] += 1
+            return entry
+
+    _omoospace_cache_info["misses"] += 1
+    omoospace = None
+    # an unsaved file is in no omoospace, nothing to import yet
+    if filepath:
+        from omoospace import Opath
+
+        try:
+            omoospace = get_cached_omoospace_class()(Opath(filepath))
+        except:
+            pass
+
+    entry = {
+        "mtime": get_profile_mtime(omoospace) if omoospace else None,
+        "checked": time.monotonic(),
+        "omoospace": omoospace,
+    }
+    _omoospace_cache[filepath] = entry
+    return entry
+
+
+def get_omoospace():
+    return get_omoospace_cache_entry()["omoospace"]
+
+
+def get_pathname():
+    entry = get_omoospace_cache_entry()
+    if "pathname" not in entry:
+        from omoospace import Opath, extract_pathname
+
+        entry["pathname"] = extract_pathname(Opath(bpy.data.filepath))
+    return entry["pathname"]
+
+
+def get_path_renderer() -> PathRenderer:
+    """Renderer with the path templates of current omoospace profile."""
+    entry = get_omoospace_cache_entry()
+    if "renderer" not in entry:
+        omoospace = entry["omoospace"]
+        # not in the language table of profile keys, read as is
+        profile = omoospace._read_profile()
+        entry["renderer"] = PathRenderer(
+            omoospace.contents_dir,
+            get_pathname(),
+            input_template=profile.get("input_path_template"),
+            output_template=profile.get("output_path_template"),
+        )
+    return entry["renderer"]
+
+
+def get_omoospace_cache_info() -> dict:
+    return {**_omoospace_cache_info, "size": len(_omoospace_cache)}
+
+
+def clear_omoospace_cache():
+    _omoospace_cache.clear()
+
+
+class SubspaceData:
+    """In-memory copy of the omoospace_subspace.json text datablock.
+
+    Parsed once per file load, written back only by flush() in save_pre.
+    """
+
+    def __init__(self):
+        self._data: dict = None
+        self.dirty = False
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self.load()
+        return self._data
+
+    def load(self):
+        self._data = {}
+        self.dirty = False
+
+        if SUBSPACE_JSON not in bpy.data.texts:
+            return
+
+        try:
+            self._data = json.loads(bpy.data.texts[SUBSPACE_JSON].as_string())
+        except:
+            self._data = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        if self.data.get(key) != value:
+            self.data[key] = value
+            self.dirty = True
+
+    def update(self, values: dict):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def flush(self):
+        if not self.dirty:
+            return
+
+        if SUBSPACE_JSON not in bpy.data.texts:
+            bpy.data.texts.new(SUBSPACE_JSON)
+
+        subspace_text = bpy.data.texts[SUBSPACE_JSON]
+        subspace_text.clear()
+        subspace_text.write(json.dumps(self.data, indent=4))
+        self.dirty = False
+
+
+subspace_data = SubspaceData()
+
+
+def get_subspace_data(key: str) -> Any:
+    return subspace_data.get(key)
+
+
+def set_subspace_data(key: str, value: Any):
+    subspace_data.set(key, value)